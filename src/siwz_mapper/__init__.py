@@ -16,6 +16,7 @@ from .models import (
     EntityMapping,
     VariantResult,
     DocumentResult,
+    DocumentMetadata,
     ValidationHelper,
 )
 
@@ -33,6 +34,7 @@ __all__ = [
     "EntityMapping",
     "VariantResult",
     "DocumentResult",
+    "DocumentMetadata",
     "ValidationHelper",
     # I/O
     "DictionaryLoader",
@@ -7,7 +7,7 @@ Supports versioning, validation, and efficient loading of large datasets.
 
 import re
 from pathlib import Path
-from typing import List, Optional, Dict, Any, Tuple
+from typing import Iterator, List, Optional, Dict, Any, Set, Tuple
 import logging
 
 import pandas as pd
@@ -46,6 +46,13 @@ class DictionaryLoader:
     # Version detection pattern from filename
     VERSION_PATTERN = re.compile(r'[_v](\d+\.?\d*\.?\d*)(?:\.|_|$)', re.IGNORECASE)
     
+    # CSV separators tried in order; the first giving more than one column wins
+    CSV_SEPARATORS = [',', ';', '\t', '|']
+    
+    # Errors meaning "wrong separator, try the next one"; anything else
+    # (e.g. an unsupported engine/option combination) is raised
+    CSV_PARSER_ERRORS = (pd.errors.ParserError, pd.errors.EmptyDataError)
+    
     def __init__(
         self,
         column_mapping: Optional[Dict[str, List[str]]] = None,
@@ -66,7 +73,9 @@ class DictionaryLoader:
         self,
         file_path: Path,
         encoding: str = 'utf-8',
-        version: Optional[str] = None
+        version: Optional[str] = None,
+        engine: Optional[str] = None,
+        chunksize: Optional[int] = None
     ) -> Tuple[List[ServiceEntry], str]:
         """
         Load services dictionary from file.
@@ -75,6 +84,10 @@ class DictionaryLoader:
             file_path: Path to CSV or XLSX file
             encoding: File encoding (for CSV)
             version: Explicit version string (overrides auto-detection)
+            engine: pandas CSV parser engine, e.g. "pyarrow" for the
+                multi-threaded Arrow reader (default: pandas' C engine)
+            chunksize: Read and convert the CSV in chunks of this many rows,
+                so only one chunk is held as a DataFrame at a time
             
         Returns:
             Tuple of (services list, version string)
@@ -87,39 +100,45 @@ class DictionaryLoader:
         if not file_path.exists():
             raise DictionaryLoadError(f"File not found: {file_path}")
         
-        logger.info(f"Loading dictionary from: {file_path}")
+        logger.info("Loading dictionary from: %s", file_path)
         
         # Detect version
         detected_version = version or self._detect_version(file_path)
-        logger.info(f"Dictionary version: {detected_version}")
-        
-        # Load data
-        try:
-            df = self._load_dataframe(file_path, encoding)
-        except Exception as e:
-            raise DictionaryLoadError(f"Failed to load file: {e}")
-        
-        # Map columns
-        df = self._map_columns(df)
-        
-        # Validate and clean
-        df = self._validate_and_clean(df)
+        logger.info("Dictionary version: %s", detected_version)
         
-        # Convert to ServiceEntry objects
-        services = self._convert_to_services(df)
+        if chunksize and file_path.suffix.lower() == '.csv':
+            services, total_rows = self._load_csv_chunked(
+                file_path, encoding, engine, chunksize
+            )
+        else:
+            # Load data
+            try:
+                df = self._load_dataframe(file_path, encoding, engine)
+            except Exception as e:
+                raise DictionaryLoadError(f"Failed to load file: {e}")
+            
+            # Map columns
+            df = self._map_columns(df)
+            
+            # Validate and clean
+            df = self._validate_and_clean(df)
+            
+            # Convert to ServiceEntry objects
+            services = self._convert_to_services(df)
+            total_rows = len(df)
         
         # Final validation
         self._validate_services(services)
         
         # Store stats
         self.stats = {
-            'total_rows': len(df),
+            'total_rows': total_rows,
             'valid_services': len(services),
             'version': detected_version,
             'source_file': str(file_path),
         }
         
-        logger.info(f"Loaded {len(services)} services (version: {detected_version})")
+        logger.info("Loaded %d services (version: %s)", len(services), detected_version)
         
         return services, detected_version
     
@@ -138,7 +157,7 @@ class DictionaryLoader:
         Returns:
             Tuple of (services list, version string)
         """
-        logger.info(f"Loading dictionary from DataFrame ({len(df)} rows)")
+        logger.info("Loading dictionary from DataFrame (%d rows)", len(df))
         
         # Map columns
         df = self._map_columns(df)
@@ -152,24 +171,103 @@ class DictionaryLoader:
         # Final validation
         self._validate_services(services)
         
-        logger.info(f"Loaded {len(services)} services")
+        logger.info("Loaded %d services", len(services))
         
         return services, version
     
-    def _load_dataframe(self, file_path: Path, encoding: str) -> pd.DataFrame:
+    def _load_csv_chunked(
+        self,
+        file_path: Path,
+        encoding: str,
+        engine: Optional[str],
+        chunksize: int
+    ) -> Tuple[List[ServiceEntry], int]:
+        """
+        Load services from a CSV one chunk at a time.
+        
+        Each chunk is mapped, cleaned and converted before the next one is
+        read, so only one chunk is held as a DataFrame. Duplicate codes are
+        also checked across chunks (first occurrence wins when not strict).
+        
+        Returns:
+            Tuple of (services list, number of rows kept)
+        """
+        services: List[ServiceEntry] = []
+        seen_codes: Set[str] = set()
+        total_rows = 0
+        
+        try:
+            chunks = self._iter_csv_chunks(file_path, encoding, engine, chunksize)
+            for chunk in chunks:
+                df = self._validate_and_clean(self._map_columns(chunk))
+                
+                repeated = df['code'].isin(seen_codes)
+                if repeated.any():
+                    dup_codes = df.loc[repeated, 'code'].unique().tolist()
+                    error_msg = f"Found {len(dup_codes)} duplicate codes: {dup_codes[:5]}"
+                    if self.strict_validation:
+                        raise DictionaryLoadError(error_msg)
+                    logger.warning(error_msg)
+                    df = df[~repeated]
+                
+                seen_codes.update(df['code'])
+                services.extend(self._convert_to_services(df))
+                total_rows += len(df)
+        except DictionaryLoadError:
+            raise
+        except Exception as e:
+            raise DictionaryLoadError(f"Failed to load file: {e}") from e
+        
+        return services, total_rows
+    
+    def _iter_csv_chunks(
+        self,
+        file_path: Path,
+        encoding: str,
+        engine: Optional[str],
+        chunksize: int
+    ) -> Iterator[pd.DataFrame]:
+        """Yield CSV chunks, using the first separator that gives several columns."""
+        for sep in self.CSV_SEPARATORS:
+            try:
+                reader = pd.read_csv(file_path, sep=sep, encoding=encoding,
+                                     engine=engine, chunksize=chunksize)
+            except self.CSV_PARSER_ERRORS:
+                continue
+            with reader:
+                try:
+                    first = next(reader)
+                except StopIteration:
+                    raise DictionaryLoadError("File contains no data") from None
+                except self.CSV_PARSER_ERRORS:
+                    continue
+                if len(first.columns) > 1:  # Valid separator found
+                    logger.debug("Reading CSV in chunks with separator '%s'", sep)
+                    yield first
+                    yield from reader
+                    return
+        
+        raise DictionaryLoadError("Could not parse CSV file with any separator")
+    
+    def _load_dataframe(
+        self,
+        file_path: Path,
+        encoding: str,
+        engine: Optional[str] = None
+    ) -> pd.DataFrame:
         """Load DataFrame from CSV or XLSX."""
         suffix = file_path.suffix.lower()
         
         if suffix == '.csv':
             # Try different separators
-            for sep in [',', ';', '\t', '|']:
+            for sep in self.CSV_SEPARATORS:
                 try:
-                    df = pd.read_csv(file_path, sep=sep, encoding=encoding)
-                    if len(df.columns) > 1:  # Valid separator found
-                        logger.debug(f"Loaded CSV with separator '{sep}'")
-                        break
-                except Exception:
+                    df = pd.read_csv(file_path, sep=sep, encoding=encoding, engine=engine)
+                except self.CSV_PARSER_ERRORS:
                     continue
+                if len(df.columns) > 1:  # Valid separator found
+                    logger.debug("Loaded CSV with separator '%s'", sep)
+                    break
             else:
                 raise DictionaryLoadError("Could not parse CSV file with any separator")
         
@@ -182,7 +280,7 @@ class DictionaryLoader:
         if df.empty:
             raise DictionaryLoadError("File contains no data")
         
-        logger.debug(f"Loaded DataFrame: {len(df)} rows, {len(df.columns)} columns")
+        logger.debug("Loaded DataFrame: %d rows, %d columns", len(df), len(df.columns))
         return df
     
     def _map_columns(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -190,7 +288,7 @@ class DictionaryLoader:
         # Normalize column names
         df.columns = df.columns.str.strip().str.lower()
         
-        logger.debug(f"Normalized columns: {list(df.columns)}")
+        logger.debug("Normalized columns: %s", list(df.columns))
         
         # Create mapping from CSV columns to standard names
         col_to_standard = {}
@@ -199,7 +297,7 @@ class DictionaryLoader:
             for col in df.columns:
                 if col in possible_lower:
                     col_to_standard[col] = standard_name
-                    logger.debug(f"Mapped '{col}' -> '{standard_name}'")
+                    logger.debug("Mapped '%s' -> '%s'", col, standard_name)
                     break
         
         # Check required fields
@@ -225,7 +323,7 @@ class DictionaryLoader:
                          if col in df.columns]
         df = df[available_cols]
         
-        logger.debug(f"Final columns after mapping: {list(df.columns)}")
+        logger.debug("Final columns after mapping: %s", list(df.columns))
         return df
     
     def _validate_and_clean(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -255,7 +353,7 @@ class DictionaryLoader:
                 df = df[df[col].notna() & (df[col] != '')]
                 after = len(df)
                 if after < before:
-                    logger.warning(f"Removed {before - after} rows with empty '{col}'")
+                    logger.warning("Removed %s rows with empty '%s'", before - after, col)
         
         # Check for duplicate codes
         if 'code' in df.columns:
@@ -280,7 +378,7 @@ class DictionaryLoader:
         removed_count = original_len - cleaned_count
         
         if removed_count > 0:
-            logger.info(f"Removed {removed_count} invalid rows ({cleaned_count} remaining)")
+            logger.info("Removed %s invalid rows (%s remaining)", removed_count, cleaned_count)
         
         # Ensure empty strings for optional fields (not None)
         for col in optional_cols:
@@ -294,8 +392,8 @@ class DictionaryLoader:
         services = []
         errors = []
         
-        logger.debug(f"Converting {len(df)} rows to ServiceEntry objects")
-        logger.debug(f"DataFrame columns: {list(df.columns)}")
+        logger.debug("Converting %d rows to ServiceEntry objects", len(df))
+        logger.debug("DataFrame columns: %s", list(df.columns))
         
         for idx, row in df.iterrows():
             try:
@@ -321,10 +419,10 @@ class DictionaryLoader:
                     'subcategory': str(row.get('subcategory', '')).strip() or None,
                     'synonyms': synonyms
                 }
-                logger.debug(f"Row {idx}: Creating ServiceEntry with data: {service_data}")
+                logger.debug("Row %s: Creating ServiceEntry with data: %s", idx, service_data)
                 service = ServiceEntry(**service_data)
                 services.append(service)
-                logger.debug(f"Row {idx}: Successfully created service {service.code}")
+                logger.debug("Row %s: Successfully created service %s", idx, service.code)
                 
             except ValidationError as e:
                 error_msg = f"Row {idx}: {e}"
@@ -342,7 +440,7 @@ class DictionaryLoader:
                     logger.warning(error_msg)
         
         if errors and not self.strict_validation:
-            logger.warning(f"Encountered {len(errors)} errors during conversion")
+            logger.warning("Encountered %d errors during conversion", len(errors))
         
         return services
     
@@ -359,7 +457,7 @@ class DictionaryLoader:
             duplicates = [code for code in unique_codes if codes.count(code) > 1]
             raise DictionaryLoadError(f"Duplicate codes found: {duplicates}")
         
-        logger.debug(f"Validated {len(services)} unique services")
+        logger.debug("Validated %d unique services", len(services))
     
     def _detect_version(self, file_path: Path) -> str:
         """Detect version from filename."""
@@ -9,19 +9,48 @@ Uses PyMuPDF (fitz) to extract text blocks with:
 Output is suitable for citation and highlighting.
 """
 
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from importlib.util import find_spec
+from itertools import accumulate, chain
 from pathlib import Path
-from typing import List
+from typing import Any, Iterator, List, Optional, Tuple
 import logging
-
-try:
-    import fitz  # PyMuPDF
-except ImportError:
-    fitz = None
+import os
+import threading
 
 from ..models import PdfSegment, BBox
 
+# PyMuPDF is imported on first use (see _get_fitz); importing it takes
+# ~100 ms, which code paths that never open a PDF should not pay
+fitz = None
+
 logger = logging.getLogger(__name__)
 
+# Document opened once per worker process by _init_worker
+_worker_doc = None
+
+
+def _get_fitz():
+    """Return the PyMuPDF module, importing it on first call."""
+    global fitz
+    if fitz is None:
+        import fitz as _fitz  # PyMuPDF
+        fitz = _fitz
+    return fitz
+
+
+def _init_worker(pdf_bytes: bytes) -> None:
+    """Process-pool initializer: open the shared PDF once per worker."""
+    global _worker_doc
+    _worker_doc = _get_fitz().open(stream=pdf_bytes, filetype="pdf")
+
+
+def _read_page_blocks(start: int, stop: int) -> List[list]:
+    """Return ``get_text("blocks")`` for pages [start, stop) of the worker's PDF."""
+    return [page.get_text("blocks") for page in _worker_doc.pages(start, stop)]
+
 
 class PDFLoadError(Exception):
     """Exception raised when PDF loading fails."""
@@ -38,12 +67,28 @@ class PDFLoader:
     - Character offsets in document
 
     Suitable for later citation and highlighting.
+
+    With ``cache_documents=True`` opened documents are kept between calls;
+    close them with ``close()`` or by using the loader as a context manager.
     """
 
+    # Read buffer for PDF files; whole files are read in a few large reads
+    READ_BUFFER_SIZE = 1 << 20
+
+    # With max_workers > 1, documents of at least this many pages are split
+    # into batches of PAGES_PER_TASK pages and extracted in worker processes
+    PARALLEL_MIN_PAGES = 32
+    PAGES_PER_TASK = 16
+
+    # Number of opened documents kept per loader with cache_documents=True
+    DOC_CACHE_SIZE = 4
+
     def __init__(
         self,
         extract_bboxes: bool = True,
         min_block_length: int = 1,
+        max_workers: int = 1,
+        cache_documents: bool = False,
     ):
         """
         Initialize PDF loader.
@@ -52,8 +97,15 @@ class PDFLoader:
             extract_bboxes: Whether to extract bounding box coordinates.
             min_block_length: Minimum number of characters in block to keep
                               (after stripping whitespace).
+            max_workers: Number of worker processes for text extraction of
+                         large documents (1 = extract in-process).
+            cache_documents: Keep up to ``DOC_CACHE_SIZE`` opened documents
+                             so ``load``, ``get_page_count`` and
+                             ``extract_page_text`` on the same file parse it
+                             once. Requires ``close()`` (or ``with``).
         """
-        if fitz is None:
+        # Only check that PyMuPDF is installed; it is imported on first load
+        if fitz is None and find_spec("fitz") is None:
             raise ImportError(
                 "PyMuPDF (fitz) is required for PDF loading. "
                 "Install with: pip install PyMuPDF"
@@ -61,18 +113,27 @@ class PDFLoader:
 
         self.extract_bboxes = extract_bboxes
         self.min_block_length = min_block_length
+        self.max_workers = max_workers
+        self.cache_documents = cache_documents
+
+        # (path, mtime_ns, size) -> (document, pdf bytes), least recently used first
+        self._doc_cache: "OrderedDict[Tuple[str, int, int], Tuple[Any, bytes]]" = OrderedDict()
+        # Held for as long as a cached document is in use; MuPDF documents
+        # must not be used from two threads at once
+        self._doc_cache_lock = threading.RLock()
 
         logger.info(
-            f"Initialized PDFLoader (bboxes={extract_bboxes}, "
-            f"min_block_length={min_block_length})"
+            "Initialized PDFLoader (bboxes=%s, min_block_length=%s, max_workers=%s)",
+            extract_bboxes, min_block_length, max_workers,
         )
 
-    def load(self, pdf_path: Path) -> List[PdfSegment]:
+    def load(self, pdf_path: Path, max_pages: Optional[int] = None) -> List[PdfSegment]:
         """
         Load PDF and extract text segments with positions.
 
         Args:
             pdf_path: Path to PDF file
+            max_pages: Only extract the first ``max_pages`` pages (default: all)
 
         Returns:
             List of PdfSegment objects with text and position info
@@ -82,46 +143,129 @@ class PDFLoader:
         """
         pdf_path = Path(pdf_path)
 
-        if not pdf_path.exists():
-            raise PDFLoadError(f"PDF file not found: {pdf_path}")
+        # One stat per load: it both checks existence and keys the cache
+        try:
+            st = os.stat(pdf_path)
+        except FileNotFoundError:
+            raise PDFLoadError(f"PDF file not found: {pdf_path}") from None
+        except OSError as e:
+            raise PDFLoadError(f"Cannot access PDF file {pdf_path}: {e}") from e
 
-        logger.info(f"Loading PDF: {pdf_path}")
+        logger.info("Loading PDF: %s", pdf_path)
 
-        try:
-            doc = fitz.open(pdf_path)
-        except Exception as e:
-            raise PDFLoadError(f"Failed to open PDF: {e}")
+        with self._open_document(pdf_path, st) as (doc, pdf_bytes):
+            segments, num_pages = self._extract_document(doc, max_pages, pdf_bytes)
 
-        segments: List[PdfSegment] = []
-        char_offset = 0
+        logger.info("Extracted %d text segments from %s pages", len(segments), num_pages)
 
-        try:
-            num_pages = len(doc)
-            for page_num in range(num_pages):
-                page = doc[page_num]
-                page_segments = self._extract_page_segments(
-                    page,
-                    page_num + 1,  # 1-indexed
-                    char_offset,
-                )
-                segments.extend(page_segments)
+        return segments
 
-                # Update global char offset based on last segment on this page
-                if page_segments:
-                    last_segment = page_segments[-1]
-                    if last_segment.end_char is not None:
-                        char_offset = last_segment.end_char
+    def close(self) -> None:
+        """Close all documents cached by this loader."""
+        with self._doc_cache_lock:
+            while self._doc_cache:
+                _, (doc, _) = self._doc_cache.popitem(last=False)
+                doc.close()
+
+    def __enter__(self) -> "PDFLoader":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    @contextmanager
+    def _open_document(
+        self,
+        pdf_path: Path,
+        st: Optional[os.stat_result] = None,
+        read_bytes: bool = True,
+    ) -> Iterator[Tuple[Any, Optional[bytes]]]:
+        """
+        Open a PDF file for the duration of a ``with`` block.
+
+        With ``read_bytes`` the file is read in one go and MuPDF parses it
+        from memory, instead of issuing many small reads against the file
+        while parsing. Without it (and without ``cache_documents``) MuPDF
+        opens the path itself and only reads the parts it needs. Without
+        ``cache_documents`` the document is closed when the block exits;
+        with it, the cached document is reused and the cache lock is held
+        until the block exits.
+
+        Args:
+            pdf_path: Path to PDF file
+            st: ``os.stat`` result for ``pdf_path`` if the caller already has
+                one (stat'ed here otherwise)
+            read_bytes: Read the whole file into memory (needed for
+                parallel extraction); always done when caching
+
+        Yields:
+            Tuple of (PyMuPDF document, raw PDF bytes or None)
+
+        Raises:
+            PDFLoadError: If the file cannot be read or opened as a PDF
+        """
+        if self.cache_documents:
+            with self._doc_cache_lock:
+                yield self._open_cached(pdf_path, st)
+            return
+
+        if read_bytes:
+            doc, pdf_bytes = self._open_file(pdf_path)
+        else:
+            try:
+                doc, pdf_bytes = _get_fitz().open(pdf_path), None
+            except Exception as e:
+                raise PDFLoadError(f"Failed to open PDF: {e}") from e
+        try:
+            yield doc, pdf_bytes
         finally:
             doc.close()
 
-        logger.info(f"Extracted {len(segments)} text segments from {num_pages} pages")
+    def _open_file(self, pdf_path: Path) -> Tuple[Any, bytes]:
+        """Read ``pdf_path`` and open it from memory."""
+        try:
+            with open(pdf_path, 'rb', buffering=self.READ_BUFFER_SIZE) as f:
+                pdf_bytes = f.read()
+            return _get_fitz().open(stream=pdf_bytes, filetype="pdf"), pdf_bytes
+        except Exception as e:
+            raise PDFLoadError(f"Failed to open PDF: {e}") from e
+
+    def _open_cached(
+        self, pdf_path: Path, st: Optional[os.stat_result] = None
+    ) -> Tuple[Any, bytes]:
+        """
+        Open a PDF file, reusing the document if it was opened before.
 
-        return segments
+        Must be called with ``_doc_cache_lock`` held. Entries are keyed by
+        path, modification time and size, so a rewritten file is opened
+        again; the least recently used documents beyond ``DOC_CACHE_SIZE``
+        are closed.
+        """
+        if st is None:
+            try:
+                st = os.stat(pdf_path)
+            except OSError as e:
+                raise PDFLoadError(f"Failed to open PDF: {e}") from e
+        key = (os.path.abspath(pdf_path), st.st_mtime_ns, st.st_size)
+
+        entry = self._doc_cache.get(key)
+        if entry is not None:
+            self._doc_cache.move_to_end(key)
+            return entry
+
+        entry = self._open_file(pdf_path)
+        self._doc_cache[key] = entry
+        while len(self._doc_cache) > self.DOC_CACHE_SIZE:
+            _, (old_doc, _) = self._doc_cache.popitem(last=False)
+            old_doc.close()
+
+        return entry
 
     def load_from_bytes(
         self,
         pdf_bytes: bytes,
         filename: str = "document.pdf",
+        max_pages: Optional[int] = None,
     ) -> List[PdfSegment]:
         """
         Load PDF from bytes.
@@ -129,39 +273,110 @@ class PDFLoader:
         Args:
             pdf_bytes: PDF file bytes
             filename: Filename for logging/debugging.
+            max_pages: Only extract the first ``max_pages`` pages (default: all)
 
         Returns:
             List of PdfSegment objects
         """
-        logger.info(f"Loading PDF from bytes: {filename}")
+        logger.info("Loading PDF from bytes: %s", filename)
 
         try:
-            doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+            doc = _get_fitz().open(stream=pdf_bytes, filetype="pdf")
         except Exception as e:
             raise PDFLoadError(f"Failed to open PDF from bytes: {e}")
 
+        try:
+            segments, _ = self._extract_document(doc, max_pages, pdf_bytes)
+        finally:
+            doc.close()
+
+        logger.info("Extracted %d segments from bytes PDF", len(segments))
+        return segments
+
+    def _extract_document(
+        self,
+        doc,
+        max_pages: Optional[int] = None,
+        pdf_bytes: Optional[bytes] = None,
+    ) -> Tuple[List[PdfSegment], int]:
+        """
+        Extract segments from the pages of an open document.
+
+        Pages are walked with the document iterator rather than indexed
+        one by one, stopping early once ``max_pages`` pages have been read.
+        Large documents are handed to worker processes instead when
+        ``max_workers > 1`` and the raw ``pdf_bytes`` are available.
+
+        Args:
+            doc: Open PyMuPDF document
+            max_pages: Maximum number of pages to extract (default: all)
+            pdf_bytes: Raw PDF content of ``doc`` (enables parallel extraction)
+
+        Returns:
+            Tuple of (segments, number of pages extracted)
+        """
+        if self.max_workers > 1 and pdf_bytes is not None:
+            num_pages = len(doc) if max_pages is None else min(len(doc), max_pages)
+            if num_pages >= self.PARALLEL_MIN_PAGES:
+                return self._extract_parallel(pdf_bytes, num_pages), num_pages
+
         segments: List[PdfSegment] = []
         char_offset = 0
+        num_pages = 0
+
+        for page in doc:
+            if max_pages is not None and num_pages >= max_pages:
+                break
+            num_pages += 1
+            page_segments = self._extract_page_segments(
+                page,
+                num_pages,  # 1-indexed
+                char_offset,
+            )
+            segments.extend(page_segments)
 
-        try:
-            num_pages = len(doc)
-            for page_num in range(num_pages):
-                page = doc[page_num]
-                page_segments = self._extract_page_segments(
-                    page,
-                    page_num + 1,
-                    char_offset,
-                )
+            # Update global char offset based on last segment on this page
+            if page_segments:
+                last_segment = page_segments[-1]
+                if last_segment.end_char is not None:
+                    char_offset = last_segment.end_char
+
+        return segments, num_pages
+
+    def _extract_parallel(self, pdf_bytes: bytes, num_pages: int) -> List[PdfSegment]:
+        """
+        Extract the first ``num_pages`` pages in a process pool.
+
+        Workers only return the raw ``get_text("blocks")`` output for their
+        page batch; segments and character offsets are built here, in page
+        order, exactly as in the in-process path.
+        """
+        starts = range(0, num_pages, self.PAGES_PER_TASK)
+        stops = [min(start + self.PAGES_PER_TASK, num_pages) for start in starts]
+        logger.debug(
+            "Extracting %d pages in %d batches with %d workers",
+            num_pages, len(stops), self.max_workers,
+        )
+
+        segments: List[PdfSegment] = []
+        char_offset = 0
+
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=(pdf_bytes,),
+        ) as pool:
+            # map() yields batches in submission order, i.e. page order
+            page_blocks = chain.from_iterable(pool.map(_read_page_blocks, starts, stops))
+            for page_num, blocks in enumerate(page_blocks, start=1):
+                page_segments = self._segments_from_blocks(blocks, page_num, char_offset)
                 segments.extend(page_segments)
 
                 if page_segments:
                     last_segment = page_segments[-1]
                     if last_segment.end_char is not None:
                         char_offset = last_segment.end_char
-        finally:
-            doc.close()
 
-        logger.info(f"Extracted {len(segments)} segments from bytes PDF")
         return segments
 
     def _extract_page_segments(
@@ -181,53 +396,55 @@ class PDFLoader:
         Returns:
             List of PdfSegment objects for this page
         """
-        segments: List[PdfSegment] = []
+        # Extract text blocks with position information in one call per page
+        return self._segments_from_blocks(page.get_text("blocks"), page_num, start_char_offset)
+
+    def _segments_from_blocks(
+        self,
+        blocks: List[tuple],
+        page_num: int,
+        start_char_offset: int,
+    ) -> List[PdfSegment]:
+        """
+        Build segments from one page's ``get_text("blocks")`` output.
+
+        Args:
+            blocks: Tuples of (x0, y0, x1, y1, "text", block_no, block_type)
+            page_num: Page number (1-indexed)
+            start_char_offset: Starting character offset for this page
+
+        Returns:
+            List of PdfSegment objects for this page
+        """
+        # Strip each block once, skipping empty/too short ones
+        min_len = self.min_block_length
+        kept = [
+            (block_idx, text, x0, y0, x1, y1)
+            for block_idx, (x0, y0, x1, y1, raw_text, _, _) in enumerate(blocks)
+            if len(text := raw_text.strip()) >= min_len
+        ]
+
+        # Start offsets of kept blocks; +1 as an implicit separator between blocks.
+        # accumulate(initial=...) yields one extra (end) offset, hence strict=False.
+        starts = accumulate(
+            (len(block[1]) + 1 for block in kept), initial=start_char_offset
+        )
 
-        # Extract text blocks with position information
-        # blocks format: (x0, y0, x1, y1, "text", block_no, block_type)
-        blocks = page.get_text("blocks")
-
-        char_offset = start_char_offset
-
-        for block_idx, block in enumerate(blocks):
-            x0, y0, x1, y1, text, block_no, block_type = block
-
-            # Skip empty/too short blocks
-            text = text.strip()
-            if len(text) < self.min_block_length:
-                continue
-
-            # Create bounding box if requested
-            bbox = None
-            if self.extract_bboxes:
-                bbox = BBox(
-                    page=page_num,
-                    x0=float(x0),
-                    y0=float(y0),
-                    x1=float(x1),
-                    y1=float(y1),
-                )
-
-            # Calculate character offsets
-            start_char = char_offset
-            end_char = char_offset + len(text)
-            # +1 as an implicit separator between blocks
-            char_offset = end_char + 1
-
-            # Create segment
-            segment_id = f"seg_p{page_num}_b{block_idx}"
-            segment = PdfSegment(
-                segment_id=segment_id,
+        extract_bboxes = self.extract_bboxes
+        id_prefix = f"seg_p{page_num}_b"
+        segments: List[PdfSegment] = [
+            PdfSegment(
+                segment_id=id_prefix + str(block_idx),
                 text=text,
                 page=page_num,
-                bbox=bbox,
+                bbox=BBox.from_fitz((x0, y0, x1, y1), page_num) if extract_bboxes else None,
                 start_char=start_char,
-                end_char=end_char,
+                end_char=start_char + len(text),
             )
+            for (block_idx, text, x0, y0, x1, y1), start_char in zip(kept, starts, strict=False)
+        ]
 
-            segments.append(segment)
-
-        logger.debug(f"Page {page_num}: extracted {len(segments)} segments")
+        logger.debug("Page %s: extracted %d segments", page_num, len(segments))
         return segments
 
     def get_page_count(self, pdf_path: Path) -> int:
@@ -244,10 +461,8 @@ class PDFLoader:
             PDFLoadError: If PDF cannot be opened
         """
         try:
-            doc = fitz.open(pdf_path)
-            page_count = len(doc)
-            doc.close()
-            return page_count
+            with self._open_document(Path(pdf_path), read_bytes=False) as (doc, _):
+                return len(doc)
         except Exception as e:
             raise PDFLoadError(f"Failed to get page count: {e}")
 
@@ -263,18 +478,14 @@ class PDFLoader:
             Text content of the page
         """
         try:
-            doc = fitz.open(pdf_path)
-
-            if page_num < 1 or page_num > len(doc):
-                raise PDFLoadError(
-                    f"Invalid page number {page_num} (PDF has {len(doc)} pages)"
-                )
-
-            page = doc[page_num - 1]  # Convert to 0-indexed
-            text = page.get_text()
-            doc.close()
+            with self._open_document(Path(pdf_path), read_bytes=False) as (doc, _):
+                if page_num < 1 or page_num > len(doc):
+                    raise PDFLoadError(
+                        f"Invalid page number {page_num} (PDF has {len(doc)} pages)"
+                    )
 
-            return text
+                page = doc[page_num - 1]  # Convert to 0-indexed
+                return page.get_text()
 
         except Exception as e:
             raise PDFLoadError(f"Failed to extract page {page_num}: {e}")
@@ -294,5 +505,4 @@ def load_pdf(
     Returns:
         List of PdfSegment objects
     """
-    loader = PDFLoader(extract_bboxes=extract_bboxes)
-    return loader.load(pdf_path)
+    return PDFLoader(extract_bboxes=extract_bboxes).load(pdf_path)
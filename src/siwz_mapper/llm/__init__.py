@@ -4,6 +4,7 @@ from .gpt_client import GPTClient, FakeGPTClient, GPTClientProtocol
 from .classify_segments import (
     classify_segment,
     classify_segments,
+    classify_segments_batch,
     SegmentClassification,
     VALID_LABELS
 )
@@ -14,6 +15,7 @@ __all__ = [
     "GPTClientProtocol",
     "classify_segment",
     "classify_segments",
+    "classify_segments_batch",
     "SegmentClassification",
     "VALID_LABELS",
 ]
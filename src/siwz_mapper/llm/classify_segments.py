@@ -4,26 +4,42 @@ Segment classification using GPT.
 Classifies PdfSegments into categories for Polish SIWZ/SWZ medical documents.
 """
 
+import io
 import json
 import logging
-from typing import List, Optional
+import sys
+from typing import Any, List, Optional
 from pydantic import BaseModel, Field, field_validator
 
+try:
+    import orjson  # optional, faster JSON parsing
+except ImportError:
+    orjson = None
+
+try:
+    import ijson  # optional, incremental parsing of large batch responses
+except ImportError:
+    ijson = None
+
 from ..models import PdfSegment
 from .gpt_client import GPTClientProtocol
 
 logger = logging.getLogger(__name__)
 
+# Shared decoder for the stdlib fallback path (skips json.loads' argument handling)
+_JSON_DECODER = json.JSONDecoder()
 
-# Valid classification labels
-VALID_LABELS = {
+
+# Valid classification labels (immutable; strings interned so that labels
+# passing validation share one object per value)
+VALID_LABELS = frozenset(map(sys.intern, (
     "irrelevant",       # introductory/legal/meta info
     "general",          # general scope description
     "variant_header",   # variant headers like "WARIANT 1"
     "variant_body",     # service lists belonging to a variant
     "prophylaxis",      # prophylactic program sections
     "pricing_table"     # pricing tables (not medical variants)
-}
+)))
 
 
 class SegmentClassification(BaseModel):
@@ -46,6 +62,8 @@ class SegmentClassification(BaseModel):
     confidence: float = Field(..., ge=0.0, le=1.0, description="Confidence score")
     rationale: str = Field(..., description="Classification rationale")
     
+    model_config = {"frozen": True}
+    
     @field_validator("label")
     @classmethod
     def validate_label(cls, v: str) -> str:
@@ -54,7 +72,7 @@ class SegmentClassification(BaseModel):
             raise ValueError(
                 f"Invalid label '{v}'. Must be one of: {', '.join(sorted(VALID_LABELS))}"
             )
-        return v
+        return sys.intern(v)
     
     @field_validator("is_prophylaxis")
     @classmethod
@@ -112,6 +130,22 @@ ANTY-HALUCYNACJA:
 Zawsze zwracaj poprawny JSON bez dodatkowego tekstu."""
 
 
+# Delimiter introducing each segment in a batch prompt ("---SEG <segment_id>---")
+BATCH_SEGMENT_MARKER = "---SEG "
+
+# Batch responses longer than this (in characters) are stream-parsed with ijson
+STREAM_PARSE_THRESHOLD = 16 * 1024
+
+# System prompt for batch classification (several segments per request)
+SYSTEM_PROMPT_BATCH = SYSTEM_PROMPT + """
+
+TRYB WSADOWY:
+Otrzymasz KILKA segmentów, każdy poprzedzony linią "---SEG id_segmentu---".
+Zwróć TABLICĘ JSON zawierającą DOKŁADNIE jeden obiekt (w formacie opisanym wyżej)
+dla każdego segmentu, w tej samej kolejności co segmenty:
+[{...}, {...}, ...]"""
+
+
 def build_user_prompt(
     segment: PdfSegment,
     prev_text: str,
@@ -155,6 +189,48 @@ def build_user_prompt(
     return "\n".join(parts)
 
 
+def build_batch_user_prompt(
+    segments: List[PdfSegment],
+    prev_text: str,
+    next_text: str
+) -> str:
+    """
+    Build user prompt classifying several consecutive segments at once.
+    
+    Args:
+        segments: Consecutive segments to classify
+        prev_text: Text of the segment before the batch (empty string if none)
+        next_text: Text of the segment after the batch (empty string if none)
+        
+    Returns:
+        Formatted user prompt
+    """
+    parts = [
+        f"Sklasyfikuj poniższe segmenty tekstu z dokumentu SIWZ ({len(segments)} segmentów).",
+        "Dla każdego segmentu wybierz DOKŁADNIE JEDNĄ etykietę z listy: "
+        "irrelevant, general, variant_header, variant_body, prophylaxis, pricing_table",
+        "Zwróć odpowiedź jako TABLICĘ JSON zgodnie z instrukcjami systemowymi.\n",
+    ]
+    
+    # Context before the batch
+    if prev_text:
+        parts.append(f"POPRZEDNI SEGMENT (kontekst):\n{prev_text[:300]}\n")
+    
+    # Segments to classify
+    for segment in segments:
+        parts.append(f"{BATCH_SEGMENT_MARKER}{segment.segment_id}---")
+        parts.append(f"Strona: {segment.page}")
+        if segment.section_label:
+            parts.append(f"Sekcja: {segment.section_label}")
+        parts.append(f"Tekst:\n{segment.text}\n")
+    
+    # Context after the batch
+    if next_text:
+        parts.append(f"NASTĘPNY SEGMENT (kontekst):\n{next_text[:300]}\n")
+    
+    return "\n".join(parts)
+
+
 def classify_segment(
     client: GPTClientProtocol,
     segment: PdfSegment,
@@ -186,15 +262,15 @@ def classify_segment(
         result = _parse_classification_response(response, segment.segment_id)
         
         logger.debug(
-            f"Classified {segment.segment_id} as '{result.label}' "
-            f"(confidence={result.confidence:.2f})"
+            "Classified %s as '%s' (confidence=%.2f)",
+            segment.segment_id, result.label, result.confidence,
         )
         
         return result
         
     except (json.JSONDecodeError, ValueError, KeyError) as e:
-        logger.warning(f"Parse error on first attempt: {e}")
-        logger.debug(f"Raw response: {response[:200]}")
+        logger.warning("Parse error on first attempt: %s", e)
+        logger.debug("Raw response: %s", response[:200])
         
         if retry_on_error:
             # Retry with stricter instruction
@@ -208,16 +284,16 @@ def classify_segment(
                 response = client.chat(SYSTEM_PROMPT, retry_prompt)
                 result = _parse_classification_response(response, segment.segment_id)
                 
-                logger.info(f"Retry successful for {segment.segment_id}")
+                logger.info("Retry successful for %s", segment.segment_id)
                 return result
                 
             except Exception as retry_error:
-                logger.error(f"Retry also failed: {retry_error}")
+                logger.error("Retry also failed: %s", retry_error)
         
         # Fallback: return low-confidence "irrelevant"
         logger.error(
-            f"Could not parse GPT response for {segment.segment_id}, "
-            f"falling back to 'irrelevant'"
+            "Could not parse GPT response for %s, falling back to 'irrelevant'",
+            segment.segment_id,
         )
         
         return SegmentClassification(
@@ -230,6 +306,31 @@ def classify_segment(
         )
 
 
+def _strip_markdown_fence(response: str) -> str:
+    """Extract JSON from a response that may be wrapped in a markdown code block."""
+    response = response.strip()
+    
+    # Remove markdown code blocks if present: drop the opening fence line
+    # (```json, ``` ...) and the closing fence
+    if response.startswith("```"):
+        response = response.partition("\n")[2].removesuffix("```").strip()
+    
+    return response
+
+
+def _loads_json(text: str) -> Any:
+    """
+    Parse JSON text, using orjson when it is installed.
+    
+    Raises:
+        json.JSONDecodeError: If text is not valid JSON (orjson's error
+            type is a subclass of it)
+    """
+    if orjson is not None:
+        return orjson.loads(text)
+    return _JSON_DECODER.decode(text)
+
+
 def _parse_classification_response(
     response: str,
     segment_id: str
@@ -248,22 +349,8 @@ def _parse_classification_response(
         json.JSONDecodeError: If response is not valid JSON
         ValueError: If required fields missing or invalid
     """
-    # Try to extract JSON if response has markdown formatting
-    response = response.strip()
-    
-    # Remove markdown code blocks if present
-    if response.startswith("```"):
-        lines = response.split("\n")
-        # Find first line that's not a markdown fence
-        start_idx = 1 if lines[0].startswith("```") else 0
-        # Find last line that's not a markdown fence
-        end_idx = len(lines) - 1
-        if lines[end_idx].startswith("```"):
-            end_idx -= 1
-        response = "\n".join(lines[start_idx:end_idx + 1]).strip()
-    
     # Parse JSON
-    data = json.loads(response)
+    data = _loads_json(_strip_markdown_fence(response))
     
     # Override segment_id with the correct one (GPT might hallucinate this)
     data["segment_id"] = segment_id
@@ -274,6 +361,64 @@ def _parse_classification_response(
     return classification
 
 
+def _parse_batch_classification_response(
+    response: str,
+    segment_ids: List[str]
+) -> List[SegmentClassification]:
+    """
+    Parse GPT batch response (JSON array) into SegmentClassifications.
+    
+    Args:
+        response: Raw GPT response (should be a JSON array)
+        segment_ids: Expected segment IDs, in order
+        
+    Returns:
+        Parsed classifications aligned with segment_ids
+        
+    Responses longer than STREAM_PARSE_THRESHOLD are parsed incrementally
+    with ijson when it is installed.
+    
+    Raises:
+        json.JSONDecodeError: If response is not valid JSON (ijson.JSONError
+            on the streaming path)
+        ValueError: If it is not an array of the expected length or items are invalid
+    """
+    text = _strip_markdown_fence(response)
+    
+    if ijson is not None and len(text) > STREAM_PARSE_THRESHOLD:
+        # Large batch: validate array items as they are parsed instead of
+        # materializing the whole decoded array first
+        items = ijson.items(io.BytesIO(text.encode("utf-8")), "item", use_float=True)
+    else:
+        items = _loads_json(text)
+        if not isinstance(items, list):
+            raise ValueError(
+                f"Expected JSON array of {len(segment_ids)} classifications, "
+                f"got {type(items).__name__}"
+            )
+    
+    classifications = []
+    for index, item in enumerate(items):
+        if index >= len(segment_ids):
+            raise ValueError(
+                f"Expected JSON array of {len(segment_ids)} classifications, got more"
+            )
+        segment_id = segment_ids[index]
+        if not isinstance(item, dict):
+            raise ValueError(f"Expected JSON object for {segment_id}, got {type(item).__name__}")
+        # Override segment_id with the correct one (GPT might hallucinate this)
+        item["segment_id"] = segment_id
+        classifications.append(SegmentClassification.model_validate(item))
+    
+    if len(classifications) != len(segment_ids):
+        raise ValueError(
+            f"Expected JSON array of {len(segment_ids)} classifications, "
+            f"got {len(classifications)}"
+        )
+    
+    return classifications
+
+
 def classify_segments(
     segments: List[PdfSegment],
     client: GPTClientProtocol,
@@ -294,13 +439,13 @@ def classify_segments(
         logger.warning("No segments to classify")
         return []
     
-    logger.info(f"Classifying {len(segments)} segments")
+    logger.info("Classifying %d segments", len(segments))
     
     classifications = []
     
     for i, segment in enumerate(segments):
         if show_progress and (i + 1) % 10 == 0:
-            logger.info(f"Progress: {i + 1}/{len(segments)} segments classified")
+            logger.info("Progress: %d/%d segments classified", i + 1, len(segments))
         
         # Get context (previous and next segment text)
         prev_text = segments[i - 1].text if i > 0 else ""
@@ -317,7 +462,7 @@ def classify_segments(
             classifications.append(classification)
             
         except Exception as e:
-            logger.error(f"Error classifying segment {segment.segment_id}: {e}")
+            logger.error("Error classifying segment %s: %s", segment.segment_id, e)
             # Add fallback classification
             classifications.append(
                 SegmentClassification(
@@ -330,14 +475,102 @@ def classify_segments(
                 )
             )
     
-    logger.info(f"Classification complete: {len(classifications)} results")
+    logger.info("Classification complete: %d results", len(classifications))
     
     # Log summary
     label_counts = {}
     for c in classifications:
         label_counts[c.label] = label_counts.get(c.label, 0) + 1
     
-    logger.info(f"Label distribution: {label_counts}")
+    logger.info("Label distribution: %s", label_counts)
     
     return classifications
 
+
+def classify_segments_batch(
+    segments: List[PdfSegment],
+    client: GPTClientProtocol,
+    batch_size: int = 8,
+    show_progress: bool = True
+) -> List[SegmentClassification]:
+    """
+    Classify multiple segments, sending up to batch_size segments per request.
+    
+    Cuts the number of LLM round-trips roughly batch_size times compared to
+    classify_segments(). If a batch response cannot be parsed, the segments
+    of that batch are classified one by one with classify_segment().
+    
+    Args:
+        segments: List of segments to classify
+        client: GPT client (or mock for testing)
+        batch_size: Maximum number of segments per request (1 = no batching)
+        show_progress: Whether to log progress
+        
+    Returns:
+        List of classifications aligned with input segments
+    """
+    if batch_size <= 1:
+        return classify_segments(segments, client, show_progress=show_progress)
+    
+    if not segments:
+        logger.warning("No segments to classify")
+        return []
+    
+    logger.info("Classifying %d segments in batches of %s", len(segments), batch_size)
+    
+    classifications = []
+    
+    for start in range(0, len(segments), batch_size):
+        batch = segments[start:start + batch_size]
+        end = start + len(batch)
+        
+        # Context around the batch
+        prev_text = segments[start - 1].text if start > 0 else ""
+        next_text = segments[end].text if end < len(segments) else ""
+        
+        user_prompt = build_batch_user_prompt(batch, prev_text, next_text)
+        
+        try:
+            response = client.chat(SYSTEM_PROMPT_BATCH, user_prompt)
+            classifications.extend(
+                _parse_batch_classification_response(
+                    response, [seg.segment_id for seg in batch]
+                )
+            )
+            
+        except Exception as e:
+            logger.warning(
+                "Batch classification failed for segments %d-%d (%s), "
+                "falling back to per-segment classification",
+                start, end - 1, e,
+            )
+            for i in range(start, end):
+                segment = segments[i]
+                try:
+                    classifications.append(
+                        classify_segment(
+                            client=client,
+                            segment=segment,
+                            prev_text=segments[i - 1].text if i > 0 else "",
+                            next_text=segments[i + 1].text if i < len(segments) - 1 else ""
+                        )
+                    )
+                except Exception as seg_error:
+                    logger.error("Error classifying segment %s: %s", segment.segment_id, seg_error)
+                    classifications.append(
+                        SegmentClassification(
+                            segment_id=segment.segment_id,
+                            label="irrelevant",
+                            variant_hint=None,
+                            is_prophylaxis=False,
+                            confidence=0.0,
+                            rationale=f"[ERROR] {str(seg_error)[:100]}"
+                        )
+                    )
+        
+        if show_progress:
+            logger.info("Progress: %d/%d segments classified", end, len(segments))
+    
+    logger.info("Classification complete: %d results", len(classifications))
+    
+    return classifications
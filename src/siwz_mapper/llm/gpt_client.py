@@ -6,6 +6,7 @@ Provides a simple, testable wrapper around OpenAI's chat completion API.
 
 import os
 import logging
+import re
 from typing import Optional, Protocol, List
 import json
 from dataclasses import dataclass
@@ -124,7 +125,8 @@ class GPTClient:
             )
         
         logger.info(
-            f"Initialized GPTClient (model={model}, temperature={temperature}, timeout={self.timeout})"
+            "Initialized GPTClient (model=%s, temperature=%s, timeout=%s)",
+            model, temperature, self.timeout,
         )
     
     def chat(self, system_prompt: str, user_prompt: str) -> str:
@@ -136,7 +138,7 @@ class GPTClient:
         - pełne prompty w call_history
         """
         try:
-            logger.debug(f"Sending chat request to {self.model}")
+            logger.debug("Sending chat request to %s", self.model)
 
             response = self.client.chat.completions.create(
                 model=self.model,
@@ -156,7 +158,7 @@ class GPTClient:
                 self.usage_stats.add(prompt_tokens, completion_tokens)
 
             content = response.choices[0].message.content
-            logger.debug(f"Received response ({len(content)} chars)")
+            logger.debug("Received response (%d chars)", len(content))
 
             # zapisujemy do historii
             self.call_history.append(
@@ -173,7 +175,7 @@ class GPTClient:
             return content
 
         except Exception as e:
-            logger.error(f"GPT API call failed: {e}")
+            logger.error("GPT API call failed: %s", e)
             raise
 
     def print_debug_report(self, max_prompt_chars: int = 300) -> None:
@@ -255,6 +257,70 @@ class FakeGPTClient:
     Returns deterministic responses based on simple keyword matching.
     """
     
+    # Canned classifications, keyed by label
+    KEYWORD_RESPONSES = {
+        "pricing_table": {
+            "segment_id": "test",
+            "label": "pricing_table",
+            "variant_hint": None,
+            "is_prophylaxis": False,
+            "confidence": 0.9,
+            "rationale": "Tabela cenowa z kolumnami wariantów"
+        },
+        "variant_header": {
+            "segment_id": "test",
+            "label": "variant_header",
+            "variant_hint": "1",
+            "is_prophylaxis": False,
+            "confidence": 0.95,
+            "rationale": "Nagłówek wariantu medycznego"
+        },
+        "irrelevant": {
+            "segment_id": "test",
+            "label": "irrelevant",
+            "variant_hint": None,
+            "is_prophylaxis": False,
+            "confidence": 0.8,
+            "rationale": "Tekst wprowadzający lub prawny"
+        },
+        "prophylaxis": {
+            "segment_id": "test",
+            "label": "prophylaxis",
+            "variant_hint": None,
+            "is_prophylaxis": True,
+            "confidence": 0.92,
+            "rationale": "Program profilaktyczny"
+        },
+        "variant_body": {
+            "segment_id": "test",
+            "label": "variant_body",
+            "variant_hint": None,
+            "is_prophylaxis": False,
+            "confidence": 0.85,
+            "rationale": "Lista usług w wariancie"
+        },
+        "general": {
+            "segment_id": "test",
+            "label": "general",
+            "variant_hint": None,
+            "is_prophylaxis": False,
+            "confidence": 0.7,
+            "rationale": "Ogólny opis zakresu"
+        },
+    }
+    
+    # Same responses, serialized once
+    _KEYWORD_RESPONSES_JSON = {
+        label: json.dumps(response, ensure_ascii=False)
+        for label, response in KEYWORD_RESPONSES.items()
+    }
+    
+    # Keyword groups (matched against lowercased segment text), one scan each
+    _PRICING_RE = re.compile(r"tabela|cenowa")
+    _IRRELEVANT_RE = re.compile(r"ogłoszenie|zamówien|rozdział i|postępowanie")
+    _PROPHYLAXIS_RE = re.compile(r"profilakt|przegląd stanu zdrowia")
+    _BODY_RE = re.compile(r"konsultacja|badanie")
+    
     def __init__(self, responses: Optional[dict] = None):
         """
         Initialize fake client.
@@ -263,6 +329,13 @@ class FakeGPTClient:
             responses: Optional dict mapping keywords to responses
         """
         self.responses = responses or {}
+        # All custom keywords in one case-insensitive alternation, one
+        # capturing group per keyword so m.lastindex identifies the match
+        self._custom_responses = list(self.responses.values())
+        self._custom_re = re.compile(
+            "|".join(f"({re.escape(keyword)})" for keyword in self.responses),
+            re.IGNORECASE,
+        ) if self.responses else None
         self.call_count = 0
         self.last_system_prompt = None
         self.last_user_prompt = None
@@ -282,10 +355,21 @@ class FakeGPTClient:
         self.last_system_prompt = system_prompt
         self.last_user_prompt = user_prompt
         
-        # Check for custom responses
-        for keyword, response in self.responses.items():
-            if keyword.lower() in user_prompt.lower():
-                return response
+        # Check for custom responses (earliest keyword occurrence wins)
+        if self._custom_re is not None:
+            match = self._custom_re.search(user_prompt)
+            if match:
+                return self._custom_responses[match.lastindex - 1]
+        
+        # Batch request: one "---SEG <id>---" section per segment -> JSON array
+        if "---SEG " in user_prompt:
+            sections = user_prompt.split("---SEG ")[1:]
+            return "[" + ", ".join(
+                self._KEYWORD_RESPONSES_JSON[
+                    self._keyword_label(section.split("NASTĘPNY SEGMENT")[0])
+                ]
+                for section in sections
+            ) + "]"
         
         # Extract the current segment (between "AKTUALNY SEGMENT" and "NASTĘPNY SEGMENT" or end)
         current_segment_text = user_prompt
@@ -297,73 +381,44 @@ class FakeGPTClient:
                 end = len(user_prompt)
             current_segment_text = user_prompt[start:end]
         
-        # Default keyword-based classification
-        user_lower = current_segment_text.lower()
+        return self._KEYWORD_RESPONSES_JSON[
+            self._keyword_label(current_segment_text, user_prompt)
+        ]
+    
+    def _keyword_label(self, segment_text: str, prompt_text: Optional[str] = None) -> str:
+        """
+        Keyword-based classification of a single segment.
+        
+        Args:
+            segment_text: Text of the segment being classified
+            prompt_text: Full prompt text (defaults to segment_text); used for
+                the bullet check, which historically looked at the whole prompt
+            
+        Returns:
+            Label (key of KEYWORD_RESPONSES)
+        """
+        if prompt_text is None:
+            prompt_text = segment_text
+        
+        user_lower = segment_text.lower()
         
         # Variant headers (check first before general irrelevant)
         if "wariant 1" in user_lower or ("załącznik" in user_lower and "wariant" in user_lower):
-            if "tabela" in user_lower or "cenowa" in user_lower or ("oferta" in user_lower and "cena" in user_lower):
-                # Pricing table
-                return json.dumps({
-                    "segment_id": "test",
-                    "label": "pricing_table",
-                    "variant_hint": None,
-                    "is_prophylaxis": False,
-                    "confidence": 0.9,
-                    "rationale": "Tabela cenowa z kolumnami wariantów"
-                }, ensure_ascii=False)
-            else:
-                # Real variant header
-                return json.dumps({
-                    "segment_id": "test",
-                    "label": "variant_header",
-                    "variant_hint": "1",
-                    "is_prophylaxis": False,
-                    "confidence": 0.95,
-                    "rationale": "Nagłówek wariantu medycznego"
-                }, ensure_ascii=False)
+            if self._PRICING_RE.search(user_lower) or ("oferta" in user_lower and "cena" in user_lower):
+                return "pricing_table"
+            return "variant_header"
         
         # General or irrelevant
-        if ("ogłoszenie" in user_lower or "zamówien" in user_lower or 
-            "rozdział i" in user_lower or "postępowanie" in user_lower):
-            return json.dumps({
-                "segment_id": "test",
-                "label": "irrelevant",
-                "variant_hint": None,
-                "is_prophylaxis": False,
-                "confidence": 0.8,
-                "rationale": "Tekst wprowadzający lub prawny"
-            }, ensure_ascii=False)
+        if self._IRRELEVANT_RE.search(user_lower):
+            return "irrelevant"
         
         # Prophylaxis
-        if "profilakt" in user_lower or "przegląd stanu zdrowia" in user_lower:
-            return json.dumps({
-                "segment_id": "test",
-                "label": "prophylaxis",
-                "variant_hint": None,
-                "is_prophylaxis": True,
-                "confidence": 0.92,
-                "rationale": "Program profilaktyczny"
-            }, ensure_ascii=False)
+        if self._PROPHYLAXIS_RE.search(user_lower):
+            return "prophylaxis"
         
         # Variant body (service lists)
-        if ("•" in user_prompt or "konsultacja" in user_lower or "badanie" in user_lower):
-            return json.dumps({
-                "segment_id": "test",
-                "label": "variant_body",
-                "variant_hint": None,
-                "is_prophylaxis": False,
-                "confidence": 0.85,
-                "rationale": "Lista usług w wariancie"
-            }, ensure_ascii=False)
+        if "•" in prompt_text or self._BODY_RE.search(user_lower):
+            return "variant_body"
         
         # Default
-        return json.dumps({
-            "segment_id": "test",
-            "label": "general",
-            "variant_hint": None,
-            "is_prophylaxis": False,
-            "confidence": 0.7,
-            "rationale": "Ogólny opis zakresu"
-        }, ensure_ascii=False)
-
+        return "general"
@@ -289,7 +289,7 @@ class ServiceBlockCategoryClassifier:
 
             except Exception as e:
                 last_err = e
-                logger.warning(f"Nie udało się sparsować JSON z odpowiedzi GPT (próba {attempt+1}): {e}")
+                logger.warning("Nie udało się sparsować JSON z odpowiedzi GPT (próba %s): %s", attempt+1, e)
 
         # Po wyczerpaniu retry – podnieś ostatni błąd
         assert last_err is not None
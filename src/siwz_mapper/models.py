@@ -4,8 +4,10 @@ Core data models for SIWZ Mapper.
 All models use Pydantic for validation and JSON serialization.
 """
 
-from typing import List, Optional, Literal, Dict, Any
-from pydantic import BaseModel, Field, field_validator
+import sys
+from functools import lru_cache
+from typing import Iterable, List, Sequence, Optional, Literal, Dict, Any, Tuple
+from pydantic import BaseModel, Field, TypeAdapter, field_validator, model_validator
 
 
 # ============================================================================
@@ -22,6 +24,7 @@ class ServiceEntry(BaseModel):
     synonyms: List[str] = Field(default_factory=list, description="Alternative names")
 
     model_config = {
+        "frozen": True,
         "json_schema_extra": {
             "example": {
                 "code": "KAR001",
@@ -41,6 +44,18 @@ class ServiceEntry(BaseModel):
         parts.extend(self.synonyms)
         return " | ".join(parts)
 
+    @field_validator("code", mode="before")
+    @classmethod
+    def intern_code(cls, v: Any) -> Any:
+        # Codes repeat across dictionary, candidates and mappings; share one object each
+        return sys.intern(v) if isinstance(v, str) else v
+
+    @field_validator("category", "subcategory", mode="before")
+    @classmethod
+    def intern_category(cls, v: Any) -> Any:
+        # A few categories cover the whole dictionary; rows share the string objects
+        return sys.intern(v) if isinstance(v, str) else v
+
 
 # ============================================================================
 # PDF Segment Models
@@ -56,6 +71,9 @@ class BBox(BaseModel):
     y1: float = Field(..., description="Top coordinate")
 
     model_config = {
+        "frozen": True,
+        # Rarely validated on its own; build the validator on first use
+        "defer_build": True,
         "json_schema_extra": {
             "example": {
                 "page": 1,
@@ -67,6 +85,21 @@ class BBox(BaseModel):
         }
     }
 
+    @classmethod
+    def from_fitz(cls, rect: Sequence[float], page: int) -> "BBox":
+        """
+        Build a bbox from a PyMuPDF rect or text-block tuple.
+
+        Only the first four items (x0, y0, x1, y1) are used, so a whole
+        ``page.get_text("blocks")`` tuple can be passed directly. Like
+        ``PdfSegment.bulk_from_tuples`` this skips validation; it is meant
+        for coordinates coming straight from PyMuPDF.
+        """
+        x0, y0, x1, y1 = rect[:4]
+        return cls.model_construct(
+            page=page, x0=float(x0), y0=float(y0), x1=float(x1), y1=float(y1)
+        )
+
 
 class PdfSegment(BaseModel):
     """A segment of text extracted from PDF with position info."""
@@ -81,6 +114,8 @@ class PdfSegment(BaseModel):
     variant_id: Optional[str] = Field(None, description="Associated variant ID")
 
     model_config = {
+        # Immutable: derived segments are built with model_copy(update=...)
+        "frozen": True,
         "json_schema_extra": {
             "example": {
                 "segment_id": "seg_001",
@@ -125,6 +160,19 @@ class PdfSegment(BaseModel):
             raise ValueError("bbox.page must match segment.page")
         return bbox
 
+    @classmethod
+    def bulk_from_tuples(cls, rows: Iterable[Tuple[str, str, int]]) -> List["PdfSegment"]:
+        """
+        Build segments from trusted (segment_id, text, page) tuples.
+
+        Uses model_construct, so no validation is run; only use it for data
+        whose shape is already guaranteed, never for external input.
+        """
+        return [
+            cls.model_construct(segment_id=segment_id, text=text, page=page)
+            for segment_id, text, page in rows
+        ]
+
 
 # ============================================================================
 # Entity Detection Models
@@ -178,6 +226,8 @@ class CandidateService(BaseModel):
     reason: str = Field(..., description="Reasoning for this match")
 
     model_config = {
+        "frozen": True,
+        "defer_build": True,
         "json_schema_extra": {
             "example": {
                 "code": "KAR001",
@@ -195,6 +245,11 @@ class CandidateService(BaseModel):
             raise ValueError("Score must be between 0 and 1")
         return v
 
+    @field_validator("code", mode="before")
+    @classmethod
+    def intern_code(cls, v: Any) -> Any:
+        return sys.intern(v) if isinstance(v, str) else v
+
 
 MappingType = Literal["1-1", "1-m", "m-1", "1-0"]
 
@@ -231,20 +286,19 @@ class EntityMapping(BaseModel):
         }
     }
 
-    @field_validator("confidence")
-    @classmethod
-    def validate_confidence(cls, v: float) -> float:
-        if not 0.0 <= v <= 1.0:
-            raise ValueError("Confidence must be between 0 and 1")
-        return v
+    # mapping_type (Literal) and confidence (ge/le) are checked by pydantic-core;
+    # only constraints spanning several fields are checked here
 
-    @field_validator("mapping_type")
+    @field_validator("primary_codes")
     @classmethod
-    def validate_mapping_type(cls, v: str) -> str:
-        valid_types = ["1-1", "1-m", "m-1", "1-0"]
-        if v not in valid_types:
-            raise ValueError(f"mapping_type must be one of {valid_types}")
-        return v
+    def intern_primary_codes(cls, v: List[str]) -> List[str]:
+        return [sys.intern(code) for code in v]
+
+    @model_validator(mode="after")
+    def validate_unmapped_has_no_codes(self) -> "EntityMapping":
+        if self.mapping_type == "1-0" and self.primary_codes:
+            raise ValueError("mapping_type '1-0' must not have primary_codes")
+        return self
 
 
 # ============================================================================
@@ -288,13 +342,26 @@ class VariantResult(BaseModel):
 # Document Result Models
 # ============================================================================
 
+class DocumentMetadata(BaseModel):
+    """Processing metadata of a document result; unknown keys are kept as extras."""
+
+    processed_at: Optional[str] = Field(None, description="Processing timestamp (ISO 8601)")
+    pipeline_version: Optional[str] = Field(None, description="Pipeline version")
+    num_segments: Optional[int] = Field(None, description="Number of extracted segments")
+    num_entities_detected: Optional[int] = Field(None, description="Number of detected entities")
+    num_variants: Optional[int] = Field(None, description="Number of variants")
+
+    model_config = {"extra": "allow", "frozen": True}
+
+
 class DocumentResult(BaseModel):
     """Complete mapping result for a SIWZ document."""
 
     doc_id: str = Field(..., description="Document identifier")
     variants: List[VariantResult] = Field(default_factory=list, description="Results per variant")
-    metadata: Dict[str, Any] = Field(
-        default_factory=dict, description="Additional metadata (timestamps, versions, etc.)"
+    metadata: DocumentMetadata = Field(
+        default_factory=DocumentMetadata,
+        description="Additional metadata (timestamps, versions, etc.)",
     )
 
     model_config = {
@@ -325,42 +392,59 @@ class DocumentResult(BaseModel):
 # Validation Helpers
 # ============================================================================
 
+# Validators for the most frequently validated outputs, built once at import
+_DOC_ADAPTER = TypeAdapter(DocumentResult)
+_SVC_ADAPTER = TypeAdapter(ServiceEntry)
+_MAPPINGS_ADAPTER = TypeAdapter(List[EntityMapping])
+
+
 class ValidationHelper:
     """Helper class for validating outputs."""
 
     @staticmethod
     def validate_document_result(data: Dict[str, Any]) -> DocumentResult:
         """Validate a document result dictionary."""
-        return DocumentResult(**data)
+        return _DOC_ADAPTER.validate_python(data)
 
     @staticmethod
     def validate_variant_result(data: Dict[str, Any]) -> VariantResult:
         """Validate a variant result dictionary."""
-        return VariantResult(**data)
+        return VariantResult.model_validate(data)
 
     @staticmethod
     def validate_entity_mapping(data: Dict[str, Any]) -> EntityMapping:
         """Validate an entity mapping dictionary."""
-        return EntityMapping(**data)
+        return EntityMapping.model_validate(data)
+
+    @staticmethod
+    def validate_mappings(data: List[Dict[str, Any]]) -> List[EntityMapping]:
+        """Validate a list of entity mapping dictionaries in one call."""
+        return _MAPPINGS_ADAPTER.validate_python(data)
 
     @staticmethod
     def validate_service_entry(data: Dict[str, Any]) -> ServiceEntry:
         """Validate a service entry dictionary."""
-        return ServiceEntry(**data)
+        return _SVC_ADAPTER.validate_python(data)
 
     @staticmethod
     def validate_pdf_segment(data: Dict[str, Any]) -> PdfSegment:
         """Validate a PDF segment dictionary."""
-        return PdfSegment(**data)
+        return PdfSegment.model_validate(data)
 
     @staticmethod
     def validate_detected_entity(data: Dict[str, Any]) -> DetectedEntity:
         """Validate a detected entity dictionary."""
-        return DetectedEntity(**data)
+        return DetectedEntity.model_validate(data)
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_json_schema(model_class) -> Dict[str, Any]:
-        """Get JSON schema for a model class."""
+        """
+        Get JSON schema for a model class.
+
+        Schemas are generated once per class and cached; treat the returned
+        dict as read-only.
+        """
         return model_class.model_json_schema()
 
     @staticmethod
@@ -372,9 +456,14 @@ class ValidationHelper:
         """
         warnings: List[str] = []
 
+        # Single pass over mappings: collect mapped codes and 1-0 violations
+        # (validated mappings cannot violate 1-0; model_construct'ed ones can)
         mapped_codes = set()
+        unmapped_with_codes: List[str] = []
         for mapping in variant.mappings:
             mapped_codes.update(mapping.primary_codes)
+            if mapping.mapping_type == "1-0" and mapping.primary_codes:
+                unmapped_with_codes.append(mapping.entity_id)
 
         core_set = set(variant.core_codes)
         prophylaxis_set = set(variant.prophylaxis_codes)
@@ -387,11 +476,8 @@ class ValidationHelper:
         if overlap:
             warnings.append(f"Codes in both core and prophylaxis: {overlap}")
 
-        for mapping in variant.mappings:
-            if mapping.mapping_type == "1-0" and mapping.primary_codes:
-                warnings.append(
-                    f"Mapping {mapping.entity_id} has type '1-0' but has primary_codes"
-                )
+        for entity_id in unmapped_with_codes:
+            warnings.append(f"Mapping {entity_id} has type '1-0' but has primary_codes")
 
         return warnings
 
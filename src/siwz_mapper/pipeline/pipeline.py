@@ -1,7 +1,6 @@
 from pathlib import Path
-from typing import Optional, List
+from typing import BinaryIO, Optional, List, Union
 import logging
-import json
 
 from ..config import Config
 from ..models import DocumentResult, ServiceEntry
@@ -26,6 +25,9 @@ class Pipeline:
     - map services
     """
 
+    # Write buffer for output files; results are written in one large write
+    WRITE_BUFFER_SIZE = 1 << 20
+
     def __init__(
         self,
         config: Optional[Config] = None,
@@ -48,8 +50,15 @@ class Pipeline:
     def process(
         self,
         pdf_path: Path,
-        output_path: Optional[Path] = None
+        output_path: Optional[Union[Path, BinaryIO]] = None
     ) -> DocumentResult:
+        """
+        Process a PDF into a DocumentResult.
+
+        ``output_path`` may be a path (the file is created or overwritten)
+        or a writable binary file object, e.g. ``io.BytesIO``, which receives
+        the UTF-8 JSON and is left open.
+        """
         segments = self.pdf_extractor.extract(pdf_path)
 
         result = DocumentResult(
@@ -62,11 +71,16 @@ class Pipeline:
         )
 
         if output_path is not None:
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            output_path.write_text(
-                json.dumps(result.model_dump(), indent=2, ensure_ascii=False),
-                encoding="utf-8",
-            )
+            # Serialized straight to JSON by pydantic-core, without first
+            # building a dict of the whole result for json.dumps
+            payload = result.model_dump_json(indent=2).encode("utf-8")
+            if hasattr(output_path, "write"):
+                output_path.write(payload)
+            else:
+                output_path = Path(output_path)
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(output_path, "wb", buffering=self.WRITE_BUFFER_SIZE) as f:
+                    f.write(payload)
 
         return result
 
@@ -5,7 +5,7 @@ Compatibility layer for pipeline/tests.
 Real mapping will be implemented later.
 """
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 import logging
 
 from ..models import ServiceEntry, DetectedEntity, EntityMapping, VariantResult
@@ -27,13 +27,19 @@ class ServiceMapper:
         services: Optional[List[ServiceEntry]] = None,
         top_k: int = 10,
     ):
-        self.services = services or []
+        self._services = tuple(services or [])
+        self._service_index = {s.code: s for s in self._services}
         self.top_k = top_k
 
     @property
-    def service_index(self):
-        """Słownik code -> ServiceEntry, liczony na bieżąco."""
-        return {s.code: s for s in self.services}
+    def services(self) -> tuple:
+        """Usługi mappera (tylko do odczytu - indeks budowany raz w __init__)."""
+        return self._services
+
+    @property
+    def service_index(self) -> Dict[str, ServiceEntry]:
+        """Słownik code -> ServiceEntry."""
+        return self._service_index
 
     def map_entities(self, entities: List[DetectedEntity]) -> List[EntityMapping]:
         # STUB: brak mapowania
@@ -125,9 +125,10 @@ class VariantAggregator:
 
         logger.info(
             "Initialized VariantAggregator "
-            f"(default={default_variant_id}, "
-            f"min_header_confidence={min_header_confidence}, "
-            f"use_header_heuristics={use_header_heuristics})"
+            "(default=%s, min_header_confidence=%s, use_header_heuristics=%s)",
+            default_variant_id,
+            min_header_confidence,
+            use_header_heuristics,
         )
 
     # ------------------------------------------------------------------ #
@@ -161,7 +162,7 @@ class VariantAggregator:
             logger.warning("No segments to aggregate")
             return [], []
 
-        logger.info(f"Aggregating {len(segments)} segments into variants")
+        logger.info("Aggregating %d segments into variants", len(segments))
 
         # 1) Wyciągnij kandydatów na nagłówki wariantów
         variant_headers = self._extract_variant_headers(segments, classifications)
@@ -169,7 +170,8 @@ class VariantAggregator:
         if not variant_headers:
             logger.info(
                 "No variant headers found after heuristics, "
-                f"using single default variant {self.default_variant_id}"
+                "using single default variant %s",
+                self.default_variant_id,
             )
             # Single variant case
             return self._aggregate_single_variant(segments, classifications)
@@ -306,8 +308,7 @@ class VariantAggregator:
         other_segments: List[PdfSegment] = []
 
         for seg, cls in zip(segments, classifications):
-            updated_seg = seg.model_copy(deep=True)
-            updated_seg.variant_id = variant_id
+            updated_seg = seg.model_copy(update={"variant_id": variant_id}, deep=True)
 
             if cls.label == "variant_body":
                 body_segments.append(updated_seg)
@@ -354,8 +355,7 @@ class VariantAggregator:
             start_idx = header_idx
             end_idx = variant_headers[i + 1][0] if i + 1 < len(variant_headers) else len(segments)
 
-            header_copy = header_seg.model_copy(deep=True)
-            header_copy.variant_id = variant_id
+            header_copy = header_seg.model_copy(update={"variant_id": variant_id}, deep=True)
 
             variant_group = VariantGroup(
                 variant_id=variant_id,
@@ -369,10 +369,8 @@ class VariantAggregator:
             for j in range(start_idx, end_idx):
                 seg = segments[j]
                 cls = classifications[j]
-                updated_seg = seg.model_copy(deep=True)
-
                 # wszystko w zakresie wariantu dostaje variant_id
-                updated_seg.variant_id = variant_id
+                updated_seg = seg.model_copy(update={"variant_id": variant_id}, deep=True)
 
                 if cls.label == "variant_header" and j == start_idx:
                     # to jest nagłówek wariantu – zapisany wyżej
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import re
-from typing import Any, Iterable, List, Optional
+from typing import Any, Iterable, Iterator, List, Optional
 
 from ..models import PdfSegment, SemanticBlock
 
@@ -47,9 +47,18 @@ class BlockSegmenter:
         """
         Group raw PdfSegment blocks into larger SemanticBlock units.
 
+        Eager variant of iter_group_blocks() – see there for details.
+        """
+        return list(self.iter_group_blocks(blocks))
+
+    def iter_group_blocks(self, blocks: List[PdfSegment]) -> Iterator[SemanticBlock]:
+        """
+        Lazily group raw PdfSegment blocks into larger SemanticBlock units.
+
         The input should be the raw blocks straight from PDFLoader
-        (before fine-grained Segmenter). The result is a list of
-        SemanticBlock objects in reading order.
+        (before fine-grained Segmenter). SemanticBlock objects are yielded
+        in reading order, so a consumer that handles one block at a time
+        does not need to keep all of them in memory.
 
         This function:
         - sorts blocks by (page, y0, x0),
@@ -60,7 +69,7 @@ class BlockSegmenter:
           is reached.
         """
         if not blocks:
-            return []
+            return
 
         sorted_blocks = sorted(
             blocks,
@@ -71,48 +80,10 @@ class BlockSegmenter:
             ),
         )
 
-        semantic_blocks: List[SemanticBlock] = []
+        num_emitted = 0
         current_segments: List[PdfSegment] = []
         current_text_parts: List[str] = []
 
-        def flush_current() -> None:
-            """Finalize the current group and create a SemanticBlock."""
-            nonlocal current_segments, current_text_parts
-
-            if not current_segments:
-                current_text_parts = []
-                return
-
-            text = "\n".join(current_text_parts).strip()
-            if not text:
-                current_segments = []
-                current_text_parts = []
-                return
-
-            page_start = current_segments[0].page
-            page_end = current_segments[-1].page
-
-            bbox = self._union_bbox(
-                [seg.bbox for seg in current_segments if seg.bbox is not None]
-            )
-
-            block_id = f"blk_{len(semantic_blocks):04d}"
-
-            semantic_blocks.append(
-                SemanticBlock(
-                    block_id=block_id,
-                    text=text,
-                    segments=list(current_segments),
-                    page_start=page_start,
-                    page_end=page_end,
-                    bbox=bbox,
-                    type_hint=self._infer_block_type(text, current_segments),
-                )
-            )
-
-            current_segments = []
-            current_text_parts = []
-
         for seg in sorted_blocks:
             raw_text = seg.text or ""
             text = raw_text.strip()
@@ -120,36 +91,60 @@ class BlockSegmenter:
                 # skip empty / whitespace-only segments
                 continue
 
-            is_heading = self._is_heading(text)
+            # Headings always start a new block; otherwise decide based on
+            # layout and length whether to start a new block.
+            if current_segments and (
+                self._is_heading(text)
+                or self._should_start_new_block(
+                    current_segments[-1], seg, current_text_parts
+                )
+            ):
+                semantic_block = self._make_semantic_block(
+                    num_emitted, current_segments, current_text_parts
+                )
+                if semantic_block is not None:
+                    num_emitted += 1
+                    yield semantic_block
+                current_segments = []
+                current_text_parts = []
 
-            if not current_segments:
-                # First segment in a new block
-                current_segments.append(seg)
-                current_text_parts.append(text)
-                continue
+            current_segments.append(seg)
+            current_text_parts.append(text)
 
-            prev = current_segments[-1]
+        # Flush the last group
+        semantic_block = self._make_semantic_block(
+            num_emitted, current_segments, current_text_parts
+        )
+        if semantic_block is not None:
+            yield semantic_block
 
-            # Headings always start a new block (after flushing current)
-            if is_heading:
-                flush_current()
-                current_segments.append(seg)
-                current_text_parts.append(text)
-                continue
+    def _make_semantic_block(
+        self,
+        index: int,
+        segments: List[PdfSegment],
+        text_parts: List[str],
+    ) -> Optional[SemanticBlock]:
+        """Finalize a group of segments into a SemanticBlock (None if empty)."""
+        if not segments:
+            return None
 
-            # Decide whether we should start a new block based on layout and length
-            if self._should_start_new_block(prev, seg, current_text_parts):
-                flush_current()
-                current_segments.append(seg)
-                current_text_parts.append(text)
-            else:
-                current_segments.append(seg)
-                current_text_parts.append(text)
+        text = "\n".join(text_parts).strip()
+        if not text:
+            return None
 
-        # Flush the last group
-        flush_current()
+        bbox = self._union_bbox(
+            [seg.bbox for seg in segments if seg.bbox is not None]
+        )
 
-        return semantic_blocks
+        return SemanticBlock(
+            block_id=f"blk_{index:04d}",
+            text=text,
+            segments=list(segments),
+            page_start=segments[0].page,
+            page_end=segments[-1].page,
+            bbox=bbox,
+            type_hint=self._infer_block_type(text, segments),
+        )
 
     # ------------------------------------------------------------------ #
     # Heuristics
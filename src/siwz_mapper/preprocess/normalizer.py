@@ -30,8 +30,31 @@ class TextNormalizer:
     # Common bullet point characters
     BULLET_CHARS = ['•', '◦', '▪', '▫', '●', '○', '■', '□', '–', '—', '-', '*']
     
-    # Hyphenation patterns (Polish/English)
-    HYPHENATION_PATTERN = re.compile(r'(\w+)-\s*\n\s*(\w+)')
+    # Zero-width and other invisible characters
+    INVISIBLE_CHARS = (
+        '\u200b',  # Zero-width space
+        '\u200c',  # Zero-width non-joiner
+        '\u200d',  # Zero-width joiner
+        '\ufeff',  # Zero-width no-break space (BOM)
+        '\u00ad',  # Soft hyphen
+    )
+    
+    # Smart/typographic quotes and their straight replacements
+    # (using Unicode escapes to avoid encoding issues)
+    QUOTE_REPLACEMENTS = (
+        ('\u201c', '"'), ('\u201d', '"'),  # Smart double quotes ""
+        ('\u201e', '"'), ('\u201f', '"'),  # Polish quotes „‟
+        ('\u2018', "'"), ('\u2019', "'"),  # Smart single quotes ''
+        ('\u201a', "'"), ('\u201b', "'"),  # Additional quotes ‚‛
+    )
+    
+    # Hyphenation patterns (Polish/English). Word quantifiers are bounded so a
+    # long run of word characters cannot make the engine backtrack across the
+    # line; \s* keeps CRLF and blank-line breaks working.
+    HYPHENATION_PATTERN = re.compile(r'(\w{1,40})-\s*\n\s*(\w{1,40})')
+    
+    # Numbered/lettered bullets: "1. ", "2) ", "a) "
+    NUMBERED_BULLET_PATTERN = re.compile(r'(\d+|[a-z])[.)]\s')
     
     def __init__(
         self,
@@ -70,8 +93,9 @@ class TextNormalizer:
         if not text:
             return text
         
-        # Unicode normalization (NFC - composed form)
-        if self.normalize_unicode:
+        # Unicode normalization (NFC - composed form); most extracted text
+        # already is NFC, which the check confirms without building a copy
+        if self.normalize_unicode and not unicodedata.is_normalized('NFC', text):
             text = unicodedata.normalize('NFC', text)
         
         # Remove zero-width and invisible characters
@@ -93,16 +117,7 @@ class TextNormalizer:
     
     def _remove_invisible_chars(self, text: str) -> str:
         """Remove zero-width and other invisible characters."""
-        # Zero-width characters
-        invisible_chars = [
-            '\u200b',  # Zero-width space
-            '\u200c',  # Zero-width non-joiner
-            '\u200d',  # Zero-width joiner
-            '\ufeff',  # Zero-width no-break space (BOM)
-            '\u00ad',  # Soft hyphen
-        ]
-        
-        for char in invisible_chars:
+        for char in self.INVISIBLE_CHARS:
             text = text.replace(char, '')
         
         return text
@@ -113,6 +128,10 @@ class TextNormalizer:
         
         Example: "dodat-\nkowy" -> "dodatkowy"
         """
+        # Fast path: most blocks contain no hyphen followed by a line break
+        if '-' not in text or '\n' not in text:
+            return text
+        
         # Match: word-\nword
         text = self.HYPHENATION_PATTERN.sub(r'\1\2', text)
         
@@ -120,13 +139,8 @@ class TextNormalizer:
     
     def _normalize_quotes(self, text: str) -> str:
         """Convert smart quotes to straight quotes."""
-        # Double quotes (using Unicode escapes to avoid encoding issues)
-        text = text.replace('\u201c', '"').replace('\u201d', '"')  # Smart double quotes ""
-        text = text.replace('\u201e', '"').replace('\u201f', '"')  # Polish quotes „‟
-        
-        # Single quotes
-        text = text.replace('\u2018', "'").replace('\u2019', "'")  # Smart single quotes ''
-        text = text.replace('\u201a', "'").replace('\u201b', "'")  # Additional quotes ‚‛
+        for smart, straight in self.QUOTE_REPLACEMENTS:
+            text = text.replace(smart, straight)
         
         return text
     
@@ -170,7 +184,7 @@ class TextNormalizer:
             return True
         
         # Check for numbered bullets (1., 2), a), etc.)
-        if re.match(r'^(\d+|[a-z])[.)][\s]', text):
+        if self.NUMBERED_BULLET_PATTERN.match(text):
             return True
         
         return False
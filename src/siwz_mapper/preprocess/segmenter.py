@@ -34,8 +34,8 @@ class Segmenter:
     SOFT_MIN = 800
     SOFT_MAX = 1200
     
-    # Sentence ending patterns (Polish/English)
-    SENTENCE_END = re.compile(r'[.!?…]+[\s\n"]')
+    # Sentence ending patterns (Polish/English); \s already covers newlines
+    SENTENCE_END = re.compile(r'[.!?…]+[\s"]')
     
     # Table detection pattern (heuristic)
     TABLE_ROW_PATTERN = re.compile(r'\s{3,}|\t')  # Multiple spaces or tab
@@ -70,8 +70,8 @@ class Segmenter:
             self.normalizer = None
         
         logger.info(
-            f"Initialized Segmenter (min={soft_min_chars}, max={soft_max_chars}, "
-            f"normalize={normalize_text})"
+            "Initialized Segmenter (min=%s, max=%s, normalize=%s)",
+            soft_min_chars, soft_max_chars, normalize_text,
         )
     
     def segment(self, blocks: List[PdfSegment]) -> List[PdfSegment]:
@@ -100,7 +100,7 @@ class Segmenter:
             block_segments = self._segment_block(block, text)
             segments.extend(block_segments)
         
-        logger.info(f"Segmented {len(blocks)} blocks into {len(segments)} segments")
+        logger.info("Segmented %d blocks into %d segments", len(blocks), len(segments))
         
         return segments
     
@@ -206,17 +206,23 @@ class Segmenter:
         - Multiple rows
         """
         lines = text.split('\n')
-        if len(lines) < 2:
+        num_lines = len(lines)
+        if num_lines < 2:
             return False
         
-        # Count lines with table-like spacing
+        # If >=50% of lines have table-like spacing, consider it a table.
+        # Stop scanning as soon as the outcome can no longer change.
+        needed = (num_lines + 1) // 2
         table_lines = 0
-        for line in lines:
+        for seen, line in enumerate(lines, start=1):
             if self.TABLE_ROW_PATTERN.search(line):
                 table_lines += 1
+                if table_lines >= needed:
+                    return True
+            elif table_lines + (num_lines - seen) < needed:
+                return False
         
-        # If >50% of lines have table-like spacing, consider it a table
-        return table_lines >= len(lines) * 0.5
+        return False
     
     def _segment_table(self, block: PdfSegment, text: str) -> List[PdfSegment]:
         """
@@ -369,7 +375,7 @@ class Segmenter:
         last_end = 0
         
         for match in self.SENTENCE_END.finditer(text):
-            end = match.start() + 1  # Include ending punctuation
+            end = match.end() - 1  # Include the whole punctuation run
             sentence = text[last_end:end].strip()
             if sentence:
                 sentences.append(sentence)
@@ -402,7 +408,7 @@ class Segmenter:
             suffix: Suffix for segment_id
             
         Returns:
-            New PdfSegment
+            New PdfSegment (or the block itself if nothing would change)
         """
         # Create new segment ID
         new_id = f"{block.segment_id}{suffix}"
@@ -414,18 +420,25 @@ class Segmenter:
             start_char = block.start_char + char_offset
             end_char = start_char + len(text)
         
-        # Approximate bbox (keep same for now - could be refined)
-        bbox = block.bbox
-        
-        return PdfSegment(
-            segment_id=new_id,
-            text=text,
-            page=block.page,
-            bbox=bbox,
-            start_char=start_char,
-            end_char=end_char,
-            section_label=block.section_label,
-            variant_id=block.variant_id
+        # Whole, unchanged block (common for short blocks) - reuse it as-is
+        if (
+            new_id == block.segment_id
+            and text == block.text
+            and start_char == block.start_char
+            and end_char == block.end_char
+        ):
+            return block
+        
+        # Copy the already-validated block instead of re-running validation;
+        # page, bbox (approximated as the block's), section_label and
+        # variant_id are carried over unchanged.
+        return block.model_copy(
+            update={
+                "segment_id": new_id,
+                "text": text,
+                "start_char": start_char,
+                "end_char": end_char,
+            }
         )
 
 
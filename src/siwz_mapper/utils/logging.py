@@ -1,46 +1,196 @@
 """Logging configuration."""
 
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
+import time
 from pathlib import Path
 
+# State of the active setup_logging() configuration: its (level, log_file)
+# arguments, the handlers it created and its queue listener (if any)
+_CONFIG = None
+_HANDLERS = []
+_LISTENER = None
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """
+    File handler that batches writes instead of flushing every record.
+
+    The file is opened with a 64 KiB buffer and flushed only for ERROR (and
+    above) records or when more than ``flush_interval`` seconds have passed
+    since the last flush. Remaining records are flushed on close, which
+    ``logging.shutdown()`` does at interpreter exit.
+
+    The file is opened in binary mode and each record is encoded once in
+    ``emit``, skipping the ``TextIOWrapper`` layer of a text-mode stream.
+    """
+
+    BUFFER_SIZE = 64 * 1024
+
+    def __init__(self, filename, mode='a', encoding=None, delay=False,
+                 flush_interval: float = 1.0):
+        self.flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+        super().__init__(filename, mode=mode, encoding=encoding, delay=delay)
+
+    def _open(self):
+        # With delay=True this runs on the first emitted record, so the log
+        # directory is only created once there is something to write
+        Path(self.baseFilename).parent.mkdir(parents=True, exist_ok=True)
+        mode = self.mode if 'b' in self.mode else self.mode + 'b'
+        return open(self.baseFilename, mode, buffering=self.BUFFER_SIZE)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self.stream is None:
+            if self.mode != 'w' or not self._closed:
+                self.stream = self._open()
+        if self.stream is None:
+            return
+        try:
+            self.stream.write((self.format(record) + self.terminator).encode(
+                self.encoding or 'utf-8', self.errors or 'strict'))
+            now = time.monotonic()
+            if (record.levelno >= logging.ERROR
+                    or now - self._last_flush >= self.flush_interval):
+                self.flush()
+                self._last_flush = now
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class CachedFormatter(logging.Formatter):
+    """
+    Formatter that formats the timestamp at most once per second.
+
+    Records created within the same wall-clock second reuse the previously
+    formatted ``asctime`` instead of calling ``time.strftime`` again. Only
+    applies when ``datefmt`` is set (which has no sub-second fields).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (second, formatted) pair, replaced as a whole so readers never see
+        # a second from one update and a string from another
+        self._time_cache = (None, "")
+
+    def formatTime(self, record: logging.LogRecord, datefmt: str = None) -> str:
+        if datefmt is None:
+            return super().formatTime(record, datefmt)
+        sec = int(record.created)
+        cached_sec, cached_str = self._time_cache
+        if sec != cached_sec:
+            cached_str = time.strftime(datefmt, self.converter(sec))
+            self._time_cache = (sec, cached_str)
+        return cached_str
+
+
+def _stop_listener() -> None:
+    """Stop the active queue listener, flushing queued records."""
+    global _LISTENER
+    if _LISTENER is not None:
+        _LISTENER.stop()
+        _LISTENER = None
+
+
+# Registered once; atexit runs it before logging's own shutdown handler
+atexit.register(_stop_listener)
+
+
+def _teardown_logging() -> None:
+    """Undo the previous setup_logging() call, leaving other root handlers alone."""
+    global _CONFIG
+    _stop_listener()
+    root = logging.getLogger()
+    for handler in _HANDLERS:
+        root.removeHandler(handler)
+        handler.close()
+    _HANDLERS.clear()
+    _CONFIG = None
+
 
 def setup_logging(level: str = "INFO", log_file: Path = None):
     """
     Setup logging configuration.
-    
+
+    Log records are put on an in-memory queue by the calling thread and
+    written to the console/file by a background listener thread, so hot
+    loops (e.g. segment classification) never block on I/O. Console-only
+    runs at WARNING or above write directly, without the queue.
+
     Args:
         level: Logging level (DEBUG, INFO, WARNING, ERROR)
         log_file: Optional file to write logs to
+
+    A repeated call with the same arguments does nothing. A call with
+    different arguments replaces the previous configuration: its listener is
+    stopped and its handlers are removed and closed. Root handlers installed
+    by anyone else (e.g. pytest's caplog) are left in place.
+
+    Callers should pass message arguments %-style
+    (``logger.debug("Parsed %s", segment_id)``) rather than as f-strings, so
+    that formatting is skipped for records below the active level; ruff's
+    ``G`` rules enforce this.
     """
+    global _CONFIG, _LISTENER
+    config = (level.upper(), Path(log_file) if log_file else None)
+    if config == _CONFIG:
+        return
+    _teardown_logging()
+
     log_level = getattr(logging, level.upper())
-    
+
     # Create formatter
-    formatter = logging.Formatter(
+    formatter = CachedFormatter(
         fmt="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S"
     )
-    
+
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
-    
+
     handlers = [console_handler]
-    
+
     # File handler if specified
     if log_file:
-        log_file.parent.mkdir(parents=True, exist_ok=True)
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        # Opened lazily on the first record; no file I/O if nothing is logged
+        file_handler = BufferedFileHandler(log_file, encoding='utf-8', delay=True)
         file_handler.setFormatter(formatter)
         handlers.append(file_handler)
-    
+
     # Configure root logger
-    logging.basicConfig(
-        level=log_level,
-        handlers=handlers
-    )
-    
+    root = logging.getLogger()
+    root.setLevel(log_level)
+
+    if log_file is None and log_level >= logging.WARNING:
+        # Console-only WARNING+ run: records are rare, so write them directly
+        # and skip the queue and its listener thread
+        root.addHandler(console_handler)
+    else:
+        # Drain queued records on a background thread; stopped (and flushed)
+        # at exit or when logging is reconfigured
+        log_queue = queue.Queue(-1)
+        _LISTENER = logging.handlers.QueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+        _LISTENER.start()
+
+        # The queue handler is added directly instead of via basicConfig(),
+        # which would give it a default formatter and cause records to be
+        # formatted twice.
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        root.addHandler(queue_handler)
+        handlers.append(queue_handler)
+
+    _HANDLERS.extend(handlers)
+
     # Silence noisy libraries
     logging.getLogger("urllib3").setLevel(logging.WARNING)
     logging.getLogger("openai").setLevel(logging.WARNING)
 
+    _CONFIG = config
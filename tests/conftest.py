@@ -0,0 +1,111 @@
+"""Shared pytest configuration for SIWZ mapper tests."""
+
+from functools import lru_cache
+
+import pytest
+
+from siwz_mapper.config import Config
+from siwz_mapper.llm import FakeGPTClient
+from siwz_mapper.models import BBox, CandidateService, PdfSegment, ServiceEntry, VariantResult
+from siwz_mapper.preprocess import Segmenter
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _warm_models():
+    """Build deferred model validators up front, not inside the first test using them."""
+    BBox.model_rebuild()
+    CandidateService.model_rebuild()
+
+
+@pytest.fixture(scope="session")
+def config():
+    """Default Config shared by the whole session (read-only)."""
+    return Config()
+
+
+@pytest.fixture(scope="session")
+def services():
+    """Two-entry services dictionary shared by the whole session (do not mutate)."""
+    return [
+        ServiceEntry(
+            code="SVC001",
+            name="Konsultacja kardiologiczna",
+            category="Kardiologia",
+            subcategory=None,
+            synonyms=[]
+        ),
+        ServiceEntry(
+            code="SVC002",
+            name="USG serca",
+            category="Kardiologia",
+            subcategory=None,
+            synonyms=[]
+        ),
+    ]
+
+
+@pytest.fixture(scope="session")
+def segmenter():
+    """Default Segmenter shared by the whole session (segment() keeps no state)."""
+    return Segmenter()
+
+
+@pytest.fixture(scope="session")
+def segmenter_factory():
+    """Segmenter(**kwargs), built once per distinct set of options."""
+    cache = {}
+
+    def make(**kwargs):
+        key = tuple(sorted(kwargs.items()))
+        if key not in cache:
+            cache[key] = Segmenter(**kwargs)
+        return cache[key]
+
+    return make
+
+
+@pytest.fixture(scope="session")
+def segment_text(segmenter_factory):
+    """
+    segment_text(text, page=1, **options): segments of a single "seg_1" block.
+
+    Results are memoized per (text, page, options) for the session and
+    returned as tuples; use it only in tests that just read the segments.
+    """
+    @lru_cache(maxsize=None)
+    def _segment(text, page, options):
+        block = PdfSegment.model_construct(segment_id="seg_1", text=text, page=page)
+        return tuple(segmenter_factory(**dict(options)).segment([block]))
+
+    def segment_text(text, page=1, **options):
+        return _segment(text, page, tuple(sorted(options.items())))
+
+    return segment_text
+
+
+@pytest.fixture(scope="module")
+def shared_client():
+    """FakeGPTClient reused within a module, for tests that only read responses."""
+    return FakeGPTClient()
+
+
+@pytest.fixture
+def fresh_client():
+    """New FakeGPTClient per test, for tests that inspect call_count/last prompts."""
+    return FakeGPTClient()
+
+
+def _make_variant(variant_id="variant_1", core=(), prophylaxis=(), mappings=()):
+    """Build a VariantResult from known-valid test data, skipping validation."""
+    return VariantResult.model_construct(
+        variant_id=variant_id,
+        core_codes=list(core),
+        prophylaxis_codes=list(prophylaxis),
+        mappings=list(mappings),
+    )
+
+
+@pytest.fixture
+def make_variant():
+    """Factory for VariantResult test data (use VariantResult(...) when testing validation)."""
+    return _make_variant
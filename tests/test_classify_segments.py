@@ -2,15 +2,12 @@
 
 import pytest
 import json
-from pathlib import Path
-import sys
-
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from siwz_mapper.models import PdfSegment
 from siwz_mapper.llm import (
     classify_segment,
     classify_segments,
+    classify_segments_batch,
     SegmentClassification,
     FakeGPTClient,
     VALID_LABELS
@@ -84,43 +81,35 @@ class TestSegmentClassification:
 class TestFakeGPTClient:
     """Tests for FakeGPTClient."""
     
-    def test_fake_client_basic(self):
+    def test_fake_client_basic(self, fresh_client):
         """Test basic fake client functionality."""
-        client = FakeGPTClient()
-        
-        response = client.chat("system", "user")
+        response = fresh_client.chat("system", "user")
         
         assert isinstance(response, str)
-        assert client.call_count == 1
-        assert client.last_system_prompt == "system"
-        assert client.last_user_prompt == "user"
+        assert fresh_client.call_count == 1
+        assert fresh_client.last_system_prompt == "system"
+        assert fresh_client.last_user_prompt == "user"
     
-    def test_fake_client_variant_header(self):
+    def test_fake_client_variant_header(self, shared_client):
         """Test fake client recognizes variant headers."""
-        client = FakeGPTClient()
-        
-        response = client.chat("system", "Załącznik nr 2 A – WARIANT 1")
+        response = shared_client.chat("system", "Załącznik nr 2 A – WARIANT 1")
         data = json.loads(response)
         
         assert data["label"] == "variant_header"
         assert data["variant_hint"] == "1"
         assert data["is_prophylaxis"] is False
     
-    def test_fake_client_prophylaxis(self):
+    def test_fake_client_prophylaxis(self, shared_client):
         """Test fake client recognizes prophylaxis."""
-        client = FakeGPTClient()
-        
-        response = client.chat("system", "Profilaktyczny przegląd stanu zdrowia")
+        response = shared_client.chat("system", "Profilaktyczny przegląd stanu zdrowia")
         data = json.loads(response)
         
         assert data["label"] == "prophylaxis"
         assert data["is_prophylaxis"] is True
     
-    def test_fake_client_pricing_table(self):
+    def test_fake_client_pricing_table(self, shared_client):
         """Test fake client recognizes pricing tables."""
-        client = FakeGPTClient()
-        
-        response = client.chat(
+        response = shared_client.chat(
             "system",
             "Tabela cenowa z kolumnami: Wariant 1, Wariant 2, Wariant 3"
         )
@@ -146,79 +135,81 @@ class TestFakeGPTClient:
         data = json.loads(response)
         
         assert data["rationale"] == "Custom response"
+    
+    def test_fake_client_custom_responses_multiple_keywords(self):
+        """Test custom keywords match case-insensitively and literally."""
+        client = FakeGPTClient(responses={
+            "alpha": "A",
+            "Beta (x)": "B",
+        })
+        
+        assert client.chat("system", "contains ALPHA") == "A"
+        assert client.chat("system", "contains beta (X) here") == "B"
+        # Keyword is matched literally, not as a regex group
+        assert client.chat("system", "contains beta x") != "B"
 
 
 class TestClassifySegment:
     """Tests for classify_segment function."""
     
-    def test_classify_variant_header(self):
+    def test_classify_variant_header(self, shared_client):
         """Test classifying a variant header."""
-        client = FakeGPTClient()
-        
         segment = PdfSegment(
             segment_id="seg_1",
             text="Załącznik nr 2 A – WARIANT 1\nZakres świadczeń medycznych",
             page=5
         )
         
-        result = classify_segment(client, segment)
+        result = classify_segment(shared_client, segment)
         
         assert result.segment_id == "seg_1"
         assert result.label == "variant_header"
         assert result.variant_hint == "1"
         assert result.confidence > 0.0
     
-    def test_classify_variant_body(self):
+    def test_classify_variant_body(self, shared_client):
         """Test classifying variant body with services."""
-        client = FakeGPTClient()
-        
         segment = PdfSegment(
             segment_id="seg_2",
             text="• Konsultacja kardiologiczna\n• Badanie EKG\n• USG serca",
             page=6
         )
         
-        result = classify_segment(client, segment)
+        result = classify_segment(shared_client, segment)
         
         assert result.segment_id == "seg_2"
         assert result.label == "variant_body"
         assert not result.is_prophylaxis
     
-    def test_classify_prophylaxis(self):
+    def test_classify_prophylaxis(self, shared_client):
         """Test classifying prophylaxis section."""
-        client = FakeGPTClient()
-        
         segment = PdfSegment(
             segment_id="seg_3",
             text="Profilaktyczny przegląd stanu zdrowia obejmuje:\n• Morfologia\n• Badanie ogólne moczu",
             page=10
         )
         
-        result = classify_segment(client, segment)
+        result = classify_segment(shared_client, segment)
         
         assert result.segment_id == "seg_3"
         assert result.label == "prophylaxis"
         assert result.is_prophylaxis is True
     
-    def test_classify_pricing_table(self):
+    def test_classify_pricing_table(self, shared_client):
         """Test classifying pricing table."""
-        client = FakeGPTClient()
-        
         segment = PdfSegment(
             segment_id="seg_4",
             text="Tabela ofertowa:\nCena za Wariant 1: ____\nCena za Wariant 2: ____",
             page=15
         )
         
-        result = classify_segment(client, segment)
+        result = classify_segment(shared_client, segment)
         
         assert result.segment_id == "seg_4"
         assert result.label == "pricing_table"
     
-    def test_classify_with_context(self):
+    def test_classify_with_context(self, shared_client):
         """Test classification with previous/next context."""
-        client = FakeGPTClient()
-        
         segment = PdfSegment(
             segment_id="seg_5",
             text="Lista badań:",
@@ -228,7 +219,7 @@ class TestClassifySegment:
         prev_text = "WARIANT 1 - Podstawowy"
         next_text = "• Badanie 1\n• Badanie 2"
         
-        result = classify_segment(client, segment, prev_text, next_text)
+        result = classify_segment(shared_client, segment, prev_text, next_text)
         
         assert result.segment_id == "seg_5"
         assert isinstance(result.label, str)
@@ -238,9 +229,8 @@ class TestClassifySegment:
 class TestClassifySegments:
     """Tests for classify_segments function."""
     
-    def test_classify_multiple_segments(self):
+    def test_classify_multiple_segments(self, shared_client):
         """Test classifying multiple segments."""
-        client = FakeGPTClient()
         
         segments = [
             PdfSegment(
@@ -260,7 +250,7 @@ class TestClassifySegments:
             ),
         ]
         
-        results = classify_segments(segments, client, show_progress=False)
+        results = classify_segments(segments, shared_client, show_progress=False)
         
         assert len(results) == 3
         assert all(isinstance(r, SegmentClassification) for r in results)
@@ -268,11 +258,10 @@ class TestClassifySegments:
         assert results[1].segment_id == "seg_2"
         assert results[2].segment_id == "seg_3"
     
-    def test_classify_empty_list(self):
+    def test_classify_empty_list(self, shared_client):
         """Test classifying empty segment list."""
-        client = FakeGPTClient()
         
-        results = classify_segments([], client)
+        results = classify_segments([], shared_client)
         
         assert results == []
     
@@ -295,6 +284,49 @@ class TestClassifySegments:
         assert client.call_count == 3
 
 
+class TestClassifySegmentsBatch:
+    """Tests for classify_segments_batch function."""
+    
+    def _segments(self):
+        return PdfSegment.bulk_from_tuples([
+            ("seg_1", "Ogłoszenie o zamówieniu publicznym", 1),
+            ("seg_2", "Załącznik nr 2 A – WARIANT 1", 5),
+            ("seg_3", "• Konsultacja lekarska\n• Badania laboratoryjne", 6),
+            ("seg_4", "Program profilaktyczny", 10),
+            ("seg_5", "Text 5", 11),
+        ])
+    
+    def test_batch_matches_single_segment_labels(self):
+        """Test that batching yields the same labels as per-segment classification."""
+        segments = self._segments()
+        
+        single = classify_segments(segments, FakeGPTClient(), show_progress=False)
+        batched = classify_segments_batch(segments, FakeGPTClient(), batch_size=2, show_progress=False)
+        
+        assert [r.segment_id for r in batched] == [s.segment_id for s in segments]
+        assert [r.label for r in batched] == [r.label for r in single]
+    
+    def test_batch_reduces_calls(self):
+        """Test that one request is sent per batch."""
+        client = FakeGPTClient()
+        
+        results = classify_segments_batch(self._segments(), client, batch_size=2, show_progress=False)
+        
+        assert len(results) == 5
+        assert client.call_count == 3
+    
+    def test_batch_fallback_on_invalid_response(self):
+        """Test per-segment fallback when the batch response cannot be parsed."""
+        client = FakeGPTClient(responses={"Text 5": "This is not JSON at all"})
+        
+        results = classify_segments_batch(self._segments(), client, batch_size=8, show_progress=False)
+        
+        assert [r.segment_id for r in results] == ["seg_1", "seg_2", "seg_3", "seg_4", "seg_5"]
+        assert results[1].label == "variant_header"
+        assert results[4].label == "irrelevant"
+        assert "FALLBACK" in results[4].rationale
+
+
 class TestParseResponse:
     """Tests for response parsing."""
     
@@ -343,65 +375,108 @@ class TestParseResponse:
         
         with pytest.raises(json.JSONDecodeError):
             _parse_classification_response("Not valid JSON", "seg_789")
+    
+    def test_parse_large_batch_response(self):
+        """Test parsing a batch response above the streaming threshold."""
+        from siwz_mapper.llm.classify_segments import (
+            _parse_batch_classification_response,
+            STREAM_PARSE_THRESHOLD,
+        )
+        
+        item = {
+            "segment_id": "ignored",
+            "label": "variant_body",
+            "variant_hint": "1",
+            "is_prophylaxis": False,
+            "confidence": 0.75,
+            "rationale": "Lista usług medycznych " * 10,
+        }
+        count = STREAM_PARSE_THRESHOLD // len(json.dumps(item)) + 10
+        segment_ids = [f"seg_{i}" for i in range(count)]
+        response = json.dumps([item] * count)
+        assert len(response) > STREAM_PARSE_THRESHOLD
+        
+        results = _parse_batch_classification_response(response, segment_ids)
+        
+        assert [r.segment_id for r in results] == segment_ids
+        assert all(r.label == "variant_body" for r in results)
+        assert results[0].confidence == 0.75
+        
+        with pytest.raises(ValueError):
+            _parse_batch_classification_response(response, segment_ids[:-1])
+
+
+REALISTIC_SIWZ_SEGMENTS = [
+    # Intro
+    PdfSegment(
+        segment_id="seg_1",
+        text="OGŁOSZENIE O ZAMÓWIENIU PUBLICZNYM\nZamówienie na ochronę zdrowia pracowników",
+        page=1
+    ),
+    # Variant header
+    PdfSegment(
+        segment_id="seg_2",
+        text="Załącznik nr 2 A – WARIANT 1\nPakiet opieki zdrowotnej podstawowej",
+        page=5
+    ),
+    # Variant body
+    PdfSegment(
+        segment_id="seg_3",
+        text="Zakres usług:\n• Konsultacje specjalistyczne\n• Badania diagnostyczne",
+        page=6
+    ),
+    # Prophylaxis
+    PdfSegment(
+        segment_id="seg_4",
+        text="Program profilaktyczny obejmuje przegląd stanu zdrowia:\n• Morfologia krwi\n• Badanie ogólne moczu",
+        page=10
+    ),
+    # Pricing table
+    PdfSegment(
+        segment_id="seg_5",
+        text="Tabela cenowa:\nCena za Wariant 1: ___zł\nCena za Wariant 2: ___zł",
+        page=15
+    ),
+]
+
+
+@pytest.fixture(scope="session")
+def classified_siwz():
+    """Realistic SIWZ segments classified once for all integration tests."""
+    return classify_segments(REALISTIC_SIWZ_SEGMENTS, FakeGPTClient(), show_progress=False)
 
 
 class TestIntegration:
     """Integration tests with realistic examples."""
     
-    def test_realistic_siwz_flow(self):
+    def test_realistic_siwz_flow(self, classified_siwz):
         """Test classification of realistic SIWZ segments."""
-        client = FakeGPTClient()
-        
-        segments = [
-            # Intro
-            PdfSegment(
-                segment_id="seg_1",
-                text="OGŁOSZENIE O ZAMÓWIENIU PUBLICZNYM\nZamówienie na ochronę zdrowia pracowników",
-                page=1
-            ),
-            # Variant header
-            PdfSegment(
-                segment_id="seg_2",
-                text="Załącznik nr 2 A – WARIANT 1\nPakiet opieki zdrowotnej podstawowej",
-                page=5
-            ),
-            # Variant body
-            PdfSegment(
-                segment_id="seg_3",
-                text="Zakres usług:\n• Konsultacje specjalistyczne\n• Badania diagnostyczne",
-                page=6
-            ),
-            # Prophylaxis
-            PdfSegment(
-                segment_id="seg_4",
-                text="Program profilaktyczny obejmuje przegląd stanu zdrowia:\n• Morfologia krwi\n• Badanie ogólne moczu",
-                page=10
-            ),
-            # Pricing table
-            PdfSegment(
-                segment_id="seg_5",
-                text="Tabela cenowa:\nCena za Wariant 1: ___zł\nCena za Wariant 2: ___zł",
-                page=15
-            ),
+        assert len(classified_siwz) == 5
+        assert [r.segment_id for r in classified_siwz] == [
+            s.segment_id for s in REALISTIC_SIWZ_SEGMENTS
         ]
-        
-        results = classify_segments(segments, client, show_progress=False)
-        
-        assert len(results) == 5
-        
-        # Check labels
-        assert results[0].label == "irrelevant"  # intro
-        assert results[1].label == "variant_header"  # variant header
-        assert results[2].label == "variant_body"  # services
-        assert results[3].label == "prophylaxis"  # prophylaxis
-        assert results[4].label == "pricing_table"  # pricing
-        
-        # Check prophylaxis flag
-        assert not results[0].is_prophylaxis
-        assert not results[1].is_prophylaxis
-        assert not results[2].is_prophylaxis
-        assert results[3].is_prophylaxis
-        assert not results[4].is_prophylaxis
+    
+    @pytest.mark.parametrize("idx,label", [
+        (0, "irrelevant"),      # intro
+        (1, "variant_header"),  # variant header
+        (2, "variant_body"),    # services
+        (3, "prophylaxis"),     # prophylaxis
+        (4, "pricing_table"),   # pricing
+    ])
+    def test_realistic_label(self, classified_siwz, idx, label):
+        """Test each realistic segment gets the expected label."""
+        assert classified_siwz[idx].label == label
+    
+    @pytest.mark.parametrize("idx,is_prophylaxis", [
+        (0, False),
+        (1, False),
+        (2, False),
+        (3, True),
+        (4, False),
+    ])
+    def test_realistic_prophylaxis_flag(self, classified_siwz, idx, is_prophylaxis):
+        """Test the prophylaxis flag of each realistic segment."""
+        assert classified_siwz[idx].is_prophylaxis is is_prophylaxis
 
 
 class TestErrorHandling:
@@ -3,10 +3,6 @@
 import pytest
 from pydantic import ValidationError
 
-import sys
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-
 from siwz_mapper.models import (
     ServiceEntry,
     BBox,
@@ -16,21 +12,72 @@ from siwz_mapper.models import (
     EntityMapping,
     VariantResult,
     DocumentResult,
+    DocumentMetadata,
     ValidationHelper,
 )
 
 
+# Canonical instances, validated once per module. Tests treat them as
+# read-only and derive variations with model_copy(update=...).
+
+@pytest.fixture(scope="module")
+def sample_service():
+    return ServiceEntry(
+        code="KAR001",
+        name="Konsultacja kardiologiczna",
+        category="Kardiologia",
+        subcategory="Konsultacje"
+    )
+
+
+@pytest.fixture(scope="module")
+def sample_bbox():
+    return BBox(page=5, x0=50.0, y0=200.0, x1=400.0, y1=220.0)
+
+
+@pytest.fixture(scope="module")
+def sample_mapping():
+    return EntityMapping(
+        entity_id="ent_001",
+        mapping_type="1-1",
+        primary_codes=["KAR001"],
+        rationale="Dokładne dopasowanie",
+        confidence=0.95
+    )
+
+
+@pytest.fixture
+def base_mapping_kwargs():
+    return {"entity_id": "ent_001", "primary_codes": [], "rationale": "Test", "confidence": 0.5}
+
+
+@pytest.fixture
+def base_entity_kwargs():
+    return {
+        "entity_id": "ent_001",
+        "segment_id": "seg_001",
+        "text": "test",
+        "quote": "Test",
+        "page": 1,
+    }
+
+
+@pytest.fixture(scope="module")
+def sample_variant():
+    return VariantResult(
+        variant_id="variant_1",
+        core_codes=["KAR001"],
+        prophylaxis_codes=[],
+        mappings=[]
+    )
+
+
 class TestServiceEntry:
     """Tests for ServiceEntry model."""
     
-    def test_create_service_entry(self):
+    def test_create_service_entry(self, sample_service):
         """Test basic ServiceEntry creation."""
-        service = ServiceEntry(
-            code="KAR001",
-            name="Konsultacja kardiologiczna",
-            category="Kardiologia",
-            subcategory="Konsultacje"
-        )
+        service = sample_service
         
         assert service.code == "KAR001"
         assert service.name == "Konsultacja kardiologiczna"
@@ -38,6 +85,15 @@ class TestServiceEntry:
         assert service.subcategory == "Konsultacje"
         assert service.synonyms == []
     
+    def test_service_entry_is_frozen_and_interns_code(self, sample_service):
+        """Test ServiceEntry is immutable and shares code strings."""
+        with pytest.raises(ValidationError):
+            sample_service.code = "KAR002"
+        
+        code = "".join(["KAR", "001"])  # built at runtime, not a literal
+        service = ServiceEntry(code=code, name="Test", category="Cat")
+        assert service.code is sample_service.code
+    
     def test_service_entry_with_synonyms(self):
         """Test ServiceEntry with synonyms."""
         service = ServiceEntry(
@@ -50,15 +106,9 @@ class TestServiceEntry:
         assert len(service.synonyms) == 2
         assert "wizyta kardiologiczna" in service.synonyms
     
-    def test_service_entry_to_search_text(self):
+    def test_service_entry_to_search_text(self, sample_service):
         """Test to_search_text method."""
-        service = ServiceEntry(
-            code="KAR001",
-            name="Konsultacja",
-            category="Kardiologia",
-            subcategory="Konsultacje",
-            synonyms=["wizyta"]
-        )
+        service = sample_service.model_copy(update={"synonyms": ["wizyta"]})
         
         search_text = service.to_search_text()
         assert "KAR001" in search_text
@@ -66,16 +116,12 @@ class TestServiceEntry:
         assert "Kardiologia" in search_text
         assert "wizyta" in search_text
     
-    def test_service_entry_json_roundtrip(self):
+    def test_service_entry_json_roundtrip(self, sample_service):
         """Test JSON serialization/deserialization."""
-        service = ServiceEntry(
-            code="KAR001",
-            name="Test",
-            category="Cat"
-        )
+        service = sample_service
         
-        json_data = service.model_dump()
-        service2 = ServiceEntry(**json_data)
+        raw = service.model_dump_json()
+        service2 = ServiceEntry.model_validate_json(raw)
         
         assert service2.code == service.code
         assert service2.name == service.name
@@ -84,14 +130,21 @@ class TestServiceEntry:
 class TestBBoxAndPdfSegment:
     """Tests for BBox and PdfSegment models."""
     
-    def test_create_bbox(self):
+    def test_create_bbox(self, sample_bbox):
         """Test BBox creation."""
-        bbox = BBox(page=1, x0=50.0, y0=200.0, x1=400.0, y1=220.0)
+        bbox = sample_bbox
         
-        assert bbox.page == 1
+        assert bbox.page == 5
         assert bbox.x0 == 50.0
         assert bbox.y1 == 220.0
     
+    def test_bbox_from_fitz_block(self):
+        """Test BBox built from a PyMuPDF text-block tuple."""
+        bbox = BBox.from_fitz((50, 100.5, 400, 120, "Tekst", 0, 0), page=3)
+        
+        assert bbox == BBox(page=3, x0=50.0, y0=100.5, x1=400.0, y1=120.0)
+        assert isinstance(bbox.x0, float)
+    
     def test_create_pdf_segment_minimal(self):
         """Test PdfSegment with minimal fields."""
         segment = PdfSegment(
@@ -105,14 +158,13 @@ class TestBBoxAndPdfSegment:
         assert segment.page == 1
         assert segment.bbox is None
     
-    def test_create_pdf_segment_full(self):
+    def test_create_pdf_segment_full(self, sample_bbox):
         """Test PdfSegment with all fields."""
-        bbox = BBox(page=5, x0=50, y0=200, x1=400, y1=220)
         segment = PdfSegment(
             segment_id="seg_001",
             text="Konsultacja kardiologiczna",
             page=5,
-            bbox=bbox,
+            bbox=sample_bbox,
             start_char=1250,
             end_char=1276,
             section_label="Wariant 1",
@@ -126,24 +178,39 @@ class TestBBoxAndPdfSegment:
         assert segment.start_char == 1250
         assert segment.section_label == "Wariant 1"
     
-    def test_pdf_segment_page_validation(self):
-        """Test page number validation."""
+    @pytest.mark.parametrize("invalid", [
+        {"page": 0},  # page must be >= 1
+        {"page": 1, "start_char": -1},  # offsets must be >= 0
+        {"page": 1, "start_char": 10, "end_char": 5},  # end before start
+    ])
+    def test_pdf_segment_validation(self, invalid):
+        """Test page number and character offset validation."""
         with pytest.raises(ValidationError):
-            PdfSegment(
-                segment_id="seg_001",
-                text="Test",
-                page=0  # Invalid: must be >= 1
-            )
+            PdfSegment(segment_id="seg_001", text="Test", **invalid)
     
-    def test_pdf_segment_char_offset_validation(self):
-        """Test character offset validation."""
+    def test_pdf_segment_is_frozen(self):
+        """Test segments are immutable; updates go through model_copy."""
+        segment = PdfSegment(segment_id="seg_001", text="Test", page=1)
+        
         with pytest.raises(ValidationError):
-            PdfSegment(
-                segment_id="seg_001",
-                text="Test",
-                page=1,
-                start_char=-1  # Invalid: must be >= 0
-            )
+            segment.variant_id = "V1"
+        
+        updated = segment.model_copy(update={"variant_id": "V1"})
+        assert updated.variant_id == "V1"
+        assert segment.variant_id is None
+    
+    def test_pdf_segment_bulk_from_tuples(self):
+        """Test building segments from trusted tuples."""
+        segments = PdfSegment.bulk_from_tuples([
+            ("seg_001", "Konsultacja", 1),
+            ("seg_002", "USG serca", 2),
+        ])
+        
+        assert [s.segment_id for s in segments] == ["seg_001", "seg_002"]
+        assert segments[1].text == "USG serca"
+        assert segments[1].page == 2
+        assert segments[0].bbox is None
+        assert segments[0].variant_id is None
 
 
 class TestDetectedEntity:
@@ -182,40 +249,17 @@ class TestDetectedEntity:
         assert entity.start_char == 100
         assert entity.end_char == 104
     
-    def test_detected_entity_confidence_validation(self):
-        """Test confidence validation."""
-        # Valid confidence
-        entity = DetectedEntity(
-            entity_id="ent_001",
-            segment_id="seg_001",
-            text="test",
-            quote="Test",
-            page=1,
-            confidence=0.5
-        )
-        assert entity.confidence == 0.5
-        
-        # Invalid confidence > 1
-        with pytest.raises(ValidationError):
-            DetectedEntity(
-                entity_id="ent_001",
-                segment_id="seg_001",
-                text="test",
-                quote="Test",
-                page=1,
-                confidence=1.5
-            )
-        
-        # Invalid confidence < 0
+    @pytest.mark.parametrize("confidence", [0.0, 0.5, 1.0])
+    def test_detected_entity_valid_confidence(self, base_entity_kwargs, confidence):
+        """Test confidence within [0, 1] is accepted."""
+        entity = DetectedEntity(**base_entity_kwargs, confidence=confidence)
+        assert entity.confidence == confidence
+    
+    @pytest.mark.parametrize("confidence", [-0.1, 1.5, 2.0])
+    def test_detected_entity_invalid_confidence(self, base_entity_kwargs, confidence):
+        """Test confidence outside [0, 1] is rejected."""
         with pytest.raises(ValidationError):
-            DetectedEntity(
-                entity_id="ent_001",
-                segment_id="seg_001",
-                text="test",
-                quote="Test",
-                page=1,
-                confidence=-0.1
-            )
+            DetectedEntity(**base_entity_kwargs, confidence=confidence)
 
 
 class TestCandidateService:
@@ -234,39 +278,24 @@ class TestCandidateService:
         assert candidate.score == 0.95
         assert candidate.reason == "Dokładne dopasowanie"
     
-    def test_candidate_service_score_validation(self):
-        """Test score validation."""
-        # Valid score
-        candidate = CandidateService(
-            code="KAR001",
-            name="Test",
-            score=0.5,
-            reason="Test"
-        )
+    def test_candidate_service_valid_score(self):
+        """Test score within [0, 1] is accepted."""
+        candidate = CandidateService(code="KAR001", name="Test", score=0.5, reason="Test")
         assert candidate.score == 0.5
-        
-        # Invalid score > 1
+    
+    @pytest.mark.parametrize("score", [1.5, -0.01])
+    def test_candidate_service_invalid_score(self, score):
+        """Test score outside [0, 1] is rejected."""
         with pytest.raises(ValidationError):
-            CandidateService(
-                code="KAR001",
-                name="Test",
-                score=1.5,
-                reason="Test"
-            )
+            CandidateService(code="KAR001", name="Test", score=score, reason="Test")
 
 
 class TestEntityMapping:
     """Tests for EntityMapping model."""
     
-    def test_create_entity_mapping_1_to_1(self):
+    def test_create_entity_mapping_1_to_1(self, sample_mapping):
         """Test EntityMapping with 1-1 type."""
-        mapping = EntityMapping(
-            entity_id="ent_001",
-            mapping_type="1-1",
-            primary_codes=["KAR001"],
-            rationale="Dokładne dopasowanie",
-            confidence=0.95
-        )
+        mapping = sample_mapping
         
         assert mapping.entity_id == "ent_001"
         assert mapping.mapping_type == "1-1"
@@ -302,7 +331,7 @@ class TestEntityMapping:
     def test_entity_mapping_with_candidates(self):
         """Test EntityMapping with alternative candidates."""
         candidates = [
-            CandidateService(
+            CandidateService.model_construct(
                 code="KAR005",
                 name="Konsultacja kontrolna",
                 score=0.72,
@@ -322,82 +351,51 @@ class TestEntityMapping:
         assert len(mapping.alt_candidates) == 1
         assert mapping.alt_candidates[0].code == "KAR005"
     
-    def test_entity_mapping_type_validation(self):
-        """Test mapping type validation."""
-        # Valid types
-        for mt in ["1-1", "1-m", "m-1", "1-0"]:
-            mapping = EntityMapping(
-                entity_id="ent_001",
-                mapping_type=mt,
-                primary_codes=[],
-                rationale="Test",
-                confidence=0.5
-            )
-            assert mapping.mapping_type == mt
+    @pytest.mark.parametrize("mt", ["1-1", "1-m", "m-1", "1-0"])
+    def test_valid_mapping_type(self, base_mapping_kwargs, mt):
+        """Test all supported mapping types are accepted."""
+        mapping = EntityMapping(**base_mapping_kwargs, mapping_type=mt)
+        assert mapping.mapping_type == mt
+    
+    @pytest.mark.parametrize("bad", ["invalid", "2-1", ""])
+    def test_invalid_mapping_type(self, base_mapping_kwargs, bad):
+        """Test unsupported mapping types are rejected."""
+        with pytest.raises(ValidationError):
+            EntityMapping(**base_mapping_kwargs, mapping_type=bad)
+    
+    def test_unmapped_with_codes_rejected(self, base_mapping_kwargs):
+        """Test a 1-0 mapping cannot carry primary codes."""
+        kwargs = {**base_mapping_kwargs, "primary_codes": ["KAR001"]}
         
-        # Invalid type
         with pytest.raises(ValidationError):
-            EntityMapping(
-                entity_id="ent_001",
-                mapping_type="invalid",
-                primary_codes=[],
-                rationale="Test",
-                confidence=0.5
-            )
+            EntityMapping(**kwargs, mapping_type="1-0")
 
 
 class TestVariantResult:
     """Tests for VariantResult model."""
     
-    def test_create_variant_result(self):
+    def test_create_variant_result(self, sample_variant):
         """Test VariantResult creation."""
-        variant = VariantResult(
-            variant_id="variant_1",
-            core_codes=["KAR001", "KAR002"],
-            prophylaxis_codes=[],
-            mappings=[]
-        )
+        variant = sample_variant
         
         assert variant.variant_id == "variant_1"
-        assert len(variant.core_codes) == 2
+        assert len(variant.core_codes) == 1
         assert len(variant.prophylaxis_codes) == 0
     
-    def test_variant_result_with_mappings(self):
+    def test_variant_result_with_mappings(self, sample_mapping, make_variant):
         """Test VariantResult with mappings."""
-        mapping1 = EntityMapping(
-            entity_id="ent_001",
-            mapping_type="1-1",
-            primary_codes=["KAR001"],
-            rationale="Match",
-            confidence=0.95
+        mapping2 = sample_mapping.model_copy(
+            update={"entity_id": "ent_002", "primary_codes": ["KAR002"], "confidence": 0.90}
         )
         
-        mapping2 = EntityMapping(
-            entity_id="ent_002",
-            mapping_type="1-1",
-            primary_codes=["KAR002"],
-            rationale="Match",
-            confidence=0.90
-        )
-        
-        variant = VariantResult(
-            variant_id="variant_1",
-            core_codes=["KAR001", "KAR002"],
-            prophylaxis_codes=[],
-            mappings=[mapping1, mapping2]
-        )
+        variant = make_variant(core=["KAR001", "KAR002"], mappings=[sample_mapping, mapping2])
         
         assert len(variant.mappings) == 2
         assert variant.mappings[0].entity_id == "ent_001"
     
-    def test_variant_result_with_prophylaxis(self):
+    def test_variant_result_with_prophylaxis(self, make_variant):
         """Test VariantResult with prophylaxis codes."""
-        variant = VariantResult(
-            variant_id="variant_1",
-            core_codes=["KAR001"],
-            prophylaxis_codes=["PROF001", "PROF002"],
-            mappings=[]
-        )
+        variant = make_variant(core=["KAR001"], prophylaxis=["PROF001", "PROF002"])
         
         assert len(variant.prophylaxis_codes) == 2
         assert "PROF001" in variant.prophylaxis_codes
@@ -417,28 +415,19 @@ class TestDocumentResult:
         assert doc.doc_id == "siwz_2025_test"
         assert len(doc.variants) == 0
     
-    def test_document_result_with_variants(self):
+    def test_document_result_with_variants(self, sample_variant):
         """Test DocumentResult with variants."""
-        variant1 = VariantResult(
-            variant_id="variant_1",
-            core_codes=["KAR001"],
-            prophylaxis_codes=[],
-            mappings=[]
+        variant2 = sample_variant.model_copy(
+            update={"variant_id": "variant_2", "core_codes": ["KAR001", "KAR002"]}
         )
         
-        variant2 = VariantResult(
-            variant_id="variant_2",
-            core_codes=["KAR001", "KAR002"],
-            prophylaxis_codes=[],
-            mappings=[]
-        )
-        
-        doc = DocumentResult(
+        doc = DocumentResult.model_construct(
             doc_id="siwz_2025_test",
-            variants=[variant1, variant2],
-            metadata={}
+            variants=[sample_variant, variant2],
+            metadata=DocumentMetadata()
         )
         
+        assert isinstance(doc.metadata, DocumentMetadata)
         assert len(doc.variants) == 2
         assert doc.variants[0].variant_id == "variant_1"
         assert doc.variants[1].variant_id == "variant_2"
@@ -455,29 +444,34 @@ class TestDocumentResult:
             }
         )
         
-        assert doc.metadata["processed_at"] == "2025-11-22T10:30:00"
-        assert doc.metadata["pipeline_version"] == "0.1.0"
+        assert doc.metadata.processed_at == "2025-11-22T10:30:00"
+        assert doc.metadata.pipeline_version == "0.1.0"
+        assert doc.metadata.num_segments == 150
     
-    def test_document_result_json_roundtrip(self):
-        """Test full JSON serialization/deserialization."""
-        variant = VariantResult(
-            variant_id="variant_1",
-            core_codes=["KAR001"],
-            prophylaxis_codes=[],
-            mappings=[]
+    def test_document_result_metadata_extra_keys(self):
+        """Test unknown metadata keys are kept."""
+        doc = DocumentResult(
+            doc_id="siwz_2025_test",
+            metadata={"pipeline_version": "0.1.0", "source": "upload"}
         )
         
+        assert doc.metadata.pipeline_version == "0.1.0"
+        assert doc.metadata.model_extra == {"source": "upload"}
+        assert doc.model_dump()["metadata"]["source"] == "upload"
+    
+    def test_document_result_json_roundtrip(self, sample_variant):
+        """Test full JSON serialization/deserialization."""
         doc = DocumentResult(
             doc_id="test_doc",
-            variants=[variant],
+            variants=[sample_variant],
             metadata={"version": "0.1.0"}
         )
         
         # Serialize
-        json_data = doc.model_dump()
+        raw = doc.model_dump_json()
         
         # Deserialize
-        doc2 = DocumentResult(**json_data)
+        doc2 = DocumentResult.model_validate_json(raw)
         
         assert doc2.doc_id == doc.doc_id
         assert len(doc2.variants) == len(doc.variants)
@@ -521,6 +515,33 @@ class TestValidationHelper:
         result = ValidationHelper.validate_service_entry(data)
         assert isinstance(result, ServiceEntry)
     
+    def test_validate_mappings_bulk(self):
+        """Test validating many mapping dicts at once."""
+        data = [
+            {
+                "entity_id": f"ent_{i:03d}",
+                "mapping_type": "1-1",
+                "primary_codes": [f"KAR{i:03d}"],
+                "rationale": "Test",
+                "confidence": 0.9,
+            }
+            for i in range(100)
+        ]
+        
+        result = ValidationHelper.validate_mappings(data)
+        
+        assert isinstance(result, list)
+        assert len(result) == 100
+        assert all(isinstance(m, EntityMapping) for m in result)
+        assert result[42].primary_codes == ["KAR042"]
+    
+    def test_validate_mappings_invalid(self):
+        """Test bulk validation rejects an invalid item."""
+        data = [{"entity_id": "ent_001", "mapping_type": "bad", "rationale": "Test", "confidence": 0.9}]
+        
+        with pytest.raises(ValidationError):
+            ValidationHelper.validate_mappings(data)
+    
     def test_get_json_schema(self):
         """Test get_json_schema."""
         schema = ValidationHelper.get_json_schema(ServiceEntry)
@@ -529,64 +550,45 @@ class TestValidationHelper:
         assert "code" in schema["properties"]
         assert "name" in schema["properties"]
     
-    def test_validate_mapping_type_consistency(self):
+    def test_get_json_schema_is_cached(self):
+        """Test the schema is generated once per model class."""
+        schema = ValidationHelper.get_json_schema(ServiceEntry)
+        
+        assert ValidationHelper.get_json_schema(ServiceEntry) is schema
+        assert ValidationHelper.get_json_schema(PdfSegment) is not schema
+    
+    def test_validate_mapping_type_consistency(self, sample_variant, sample_mapping):
         """Test validate_mapping_type_consistency."""
         # Valid variant
-        mapping = EntityMapping(
-            entity_id="ent_001",
-            mapping_type="1-1",
-            primary_codes=["KAR001"],
-            rationale="Test",
-            confidence=0.9
-        )
-        
-        variant = VariantResult(
-            variant_id="variant_1",
-            core_codes=["KAR001"],
-            prophylaxis_codes=[],
-            mappings=[mapping]
-        )
+        variant = sample_variant.model_copy(update={"mappings": [sample_mapping]})
         
         warnings = ValidationHelper.validate_mapping_type_consistency(variant)
         assert len(warnings) == 0
     
-    def test_validate_mapping_type_consistency_warnings(self):
+    def test_validate_mapping_type_consistency_warnings(self, sample_variant, sample_mapping):
         """Test validate_mapping_type_consistency with warnings."""
         # Variant with code not in mappings
-        variant = VariantResult(
-            variant_id="variant_1",
-            core_codes=["KAR001", "KAR999"],  # KAR999 not mapped
-            prophylaxis_codes=[],
-            mappings=[
-                EntityMapping(
-                    entity_id="ent_001",
-                    mapping_type="1-1",
-                    primary_codes=["KAR001"],
-                    rationale="Test",
-                    confidence=0.9
-                )
-            ]
-        )
+        variant = sample_variant.model_copy(update={
+            "core_codes": ["KAR001", "KAR999"],  # KAR999 not mapped
+            "mappings": [sample_mapping],
+        })
         
         warnings = ValidationHelper.validate_mapping_type_consistency(variant)
         assert len(warnings) > 0
         assert "KAR999" in warnings[0]
     
-    def test_validate_mapping_type_consistency_overlap(self):
+    def test_validate_mapping_type_consistency_overlap(self, sample_variant):
         """Test detecting codes in both core and prophylaxis."""
-        variant = VariantResult(
-            variant_id="variant_1",
-            core_codes=["KAR001"],
-            prophylaxis_codes=["KAR001"],  # Overlap!
-            mappings=[]
+        variant = sample_variant.model_copy(
+            update={"prophylaxis_codes": ["KAR001"]}  # Overlap!
         )
         
         warnings = ValidationHelper.validate_mapping_type_consistency(variant)
         assert any("both core and prophylaxis" in w for w in warnings)
     
-    def test_validate_mapping_type_consistency_1_0_with_codes(self):
+    def test_validate_mapping_type_consistency_1_0_with_codes(self, make_variant):
         """Test detecting 1-0 mapping with primary codes."""
-        mapping = EntityMapping(
+        mapping = EntityMapping.model_construct(
             entity_id="ent_001",
             mapping_type="1-0",
             primary_codes=["KAR001"],  # Invalid for 1-0!
@@ -594,12 +596,7 @@ class TestValidationHelper:
             confidence=0.5
         )
         
-        variant = VariantResult(
-            variant_id="variant_1",
-            core_codes=[],
-            prophylaxis_codes=[],
-            mappings=[mapping]
-        )
+        variant = make_variant(mappings=[mapping])
         
         warnings = ValidationHelper.validate_mapping_type_consistency(variant)
         assert any("type '1-0' but has primary_codes" in w for w in warnings)
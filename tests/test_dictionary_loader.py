@@ -1,66 +1,162 @@
 """Tests for dictionary loader."""
 
+import functools
+import os
+import sys
+
 import pytest
 from pathlib import Path
 import pandas as pd
 
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-
 from siwz_mapper.io import DictionaryLoader, DictionaryLoadError
 from siwz_mapper.io.dictionary_loader import load_dictionary
 from siwz_mapper.models import ServiceEntry
 
 
+@functools.cache
+def _make_loader(strict: bool) -> DictionaryLoader:
+    """Shared loader per validation mode (its only state is the last load's stats)."""
+    return DictionaryLoader(strict_validation=strict)
+
+
+@pytest.fixture(scope="session")
+def fixtures_dir():
+    """Get fixtures directory."""
+    return Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture(scope="session")
+def loader_session():
+    """Strict DictionaryLoader shared by tests that only load files."""
+    return _make_loader(True)
+
+
+@pytest.fixture(scope="module")
+def loader():
+    """Strict DictionaryLoader; tests reading get_stats() create their own."""
+    return _make_loader(True)
+
+
+@pytest.fixture(scope="session")
+def services_v1(loader_session, fixtures_dir):
+    """(services, version) parsed once from services_v1.0.csv."""
+    return loader_session.load(fixtures_dir / "services_v1.0.csv")
+
+
+@pytest.fixture(scope="session")
+def services_v1_by_code(services_v1):
+    """services_v1 indexed by code."""
+    return {s.code: s for s in services_v1[0]}
+
+
+@pytest.fixture(scope="session")
+def services_with_issues_non_strict(fixtures_dir):
+    """(services, version) parsed once from services_with_issues.csv in non-strict mode."""
+    return _make_loader(False).load(fixtures_dir / "services_with_issues.csv")
+
+
+@pytest.fixture(scope="session")
+def services_with_issues_strict_error(loader_session, fixtures_dir):
+    """DictionaryLoadError raised once by a strict load of services_with_issues.csv."""
+    with pytest.raises(DictionaryLoadError) as exc_info:
+        loader_session.load(fixtures_dir / "services_with_issues.csv")
+    return exc_info.value
+
+
+@pytest.fixture(scope="session")
+def services_with_issues_by_code(services_with_issues_non_strict):
+    """services_with_issues_non_strict indexed by code."""
+    return {s.code: s for s in services_with_issues_non_strict[0]}
+
+
+@pytest.fixture(scope="session")
+def large_csv(tmp_path_factory):
+    """5000-row services CSV, written as raw bytes once per session."""
+    csv_file = tmp_path_factory.mktemp("big") / "large_services.csv"
+    buf = bytearray(b"code,name,category,subcategory,synonyms\n")
+    append = buf.extend
+    for i in range(5000):
+        append(f"SVC{i:05d},Service {i},Category {i % 10},Subcat,synonym{i}\n".encode("ascii"))
+    fd = os.open(csv_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, buf)
+    finally:
+        os.close(fd)
+    return csv_file
+
+
+@pytest.fixture(scope="session")
+def large_services(loader_session, large_csv):
+    """Services parsed once from large_csv in a single (non-chunked) read."""
+    return loader_session.load(large_csv)[0]
+
+
+@pytest.fixture(scope="session")
+def polish_col_csv(tmp_path_factory):
+    """One-row CSV with Polish column names."""
+    csv_file = tmp_path_factory.mktemp("pl") / "services_pl.csv"
+    csv_file.write_text(
+        "kod,nazwa,kategoria,podkategoria,synonimy\n"
+        "KAR001,Konsultacja,Kardiologia,Konsultacje,wizyta\n",
+        encoding='utf-8'
+    )
+    return csv_file
+
+
+@pytest.fixture(scope="session")
+def invalid_csv(tmp_path_factory):
+    """CSV without any of the required columns."""
+    csv_file = tmp_path_factory.mktemp("invalid") / "invalid.csv"
+    csv_file.write_text(
+        "some_col,another_col\n"
+        "value1,value2\n"
+    )
+    return csv_file
+
+
+@pytest.fixture(scope="session")
+def small_services_csv(tmp_path_factory):
+    """Two-row CSV with only the required columns."""
+    csv_file = tmp_path_factory.mktemp("small") / "services.csv"
+    csv_file.write_text(
+        "code,name,category\n"
+        "SVC001,Service 1,Cat1\n"
+        "SVC002,Service 2,Cat2\n"
+    )
+    return csv_file
+
+
 class TestDictionaryLoader:
     """Tests for DictionaryLoader class."""
     
-    @pytest.fixture
-    def fixtures_dir(self):
-        """Get fixtures directory."""
-        return Path(__file__).parent / "fixtures"
-    
-    @pytest.fixture
-    def loader(self):
-        """Create DictionaryLoader instance."""
-        return DictionaryLoader(strict_validation=True)
-    
-    def test_load_valid_csv(self, loader, fixtures_dir):
+    def test_load_valid_csv(self, services_v1):
         """Test loading valid CSV file."""
-        csv_path = fixtures_dir / "services_v1.0.csv"
-        services, version = loader.load(csv_path)
+        services, version = services_v1
         
         assert len(services) == 10
         assert version == "1.0"
         assert all(isinstance(s, ServiceEntry) for s in services)
     
-    def test_service_fields(self, loader, fixtures_dir):
+    def test_service_fields(self, services_v1_by_code):
         """Test that service fields are correctly loaded."""
-        csv_path = fixtures_dir / "services_v1.0.csv"
-        services, _ = loader.load(csv_path)
-        
         # Check first service
-        kar001 = next(s for s in services if s.code == "KAR001")
+        kar001 = services_v1_by_code["KAR001"]
         assert kar001.name == "Konsultacja kardiologiczna"
         assert kar001.category == "Kardiologia"
         assert kar001.subcategory == "Konsultacje"
         assert "wizyta kardiologiczna" in kar001.synonyms
         assert "badanie kardiologiczne" in kar001.synonyms
     
-    def test_synonyms_parsing(self, loader, fixtures_dir):
+    def test_synonyms_parsing(self, services_v1_by_code):
         """Test synonyms parsing with different separators."""
-        csv_path = fixtures_dir / "services_v1.0.csv"
-        services, _ = loader.load(csv_path)
-        
-        kar002 = next(s for s in services if s.code == "KAR002")
+        kar002 = services_v1_by_code["KAR002"]
         assert len(kar002.synonyms) == 3
         assert "echokardiografia" in kar002.synonyms
         assert "echo serca" in kar002.synonyms
     
-    def test_version_detection_from_filename(self, loader, fixtures_dir):
+    def test_version_detection_from_filename(self, services_v1):
         """Test version detection from filename."""
-        csv_path = fixtures_dir / "services_v1.0.csv"
-        _, version = loader.load(csv_path)
+        _, version = services_v1
         assert version == "1.0"
     
     def test_explicit_version(self, loader, fixtures_dir):
@@ -69,47 +165,31 @@ class TestDictionaryLoader:
         _, version = loader.load(csv_path, version="2.5")
         assert version == "2.5"
     
-    def test_whitespace_trimming(self, loader, fixtures_dir):
+    def test_whitespace_trimming(self, services_with_issues_by_code):
         """Test that whitespace is trimmed."""
-        csv_path = fixtures_dir / "services_with_issues.csv"
-        
-        # Use non-strict mode to handle other issues
-        loader_non_strict = DictionaryLoader(strict_validation=False)
-        services, _ = loader_non_strict.load(csv_path)
-        
-        kar003 = next((s for s in services if s.code == "KAR003"), None)
+        # Non-strict mode, to handle other issues
+        kar003 = services_with_issues_by_code.get("KAR003")
         if kar003:
             assert kar003.code == "KAR003"
             assert kar003.name == "EKG spoczynkowe"
             assert kar003.category == "Kardiologia"
     
-    def test_duplicate_codes_strict(self, loader, fixtures_dir):
+    def test_duplicate_codes_strict(self, services_with_issues_strict_error):
         """Test duplicate code detection in strict mode."""
-        csv_path = fixtures_dir / "services_with_issues.csv"
-        
-        with pytest.raises(DictionaryLoadError) as exc_info:
-            loader.load(csv_path)
-        
-        assert "duplicate" in str(exc_info.value).lower()
+        assert "duplicate" in str(services_with_issues_strict_error).lower()
     
-    def test_duplicate_codes_non_strict(self, fixtures_dir):
+    def test_duplicate_codes_non_strict(self, services_with_issues_non_strict):
         """Test duplicate handling in non-strict mode."""
-        csv_path = fixtures_dir / "services_with_issues.csv"
-        loader_non_strict = DictionaryLoader(strict_validation=False)
-        
-        services, _ = loader_non_strict.load(csv_path)
+        services, _ = services_with_issues_non_strict
         
         # Should keep only first occurrence of KAR001
         kar001_entries = [s for s in services if s.code == "KAR001"]
         assert len(kar001_entries) == 1
         assert kar001_entries[0].name == "Konsultacja kardiologiczna"
     
-    def test_missing_required_fields(self, fixtures_dir):
+    def test_missing_required_fields(self, services_with_issues_non_strict):
         """Test handling of missing required fields."""
-        csv_path = fixtures_dir / "services_with_issues.csv"
-        loader_non_strict = DictionaryLoader(strict_validation=False)
-        
-        services, _ = loader_non_strict.load(csv_path)
+        services, _ = services_with_issues_non_strict
         
         # Should skip rows with missing code or name
         codes = [s.code for s in services]
@@ -143,8 +223,9 @@ class TestDictionaryLoader:
         
         assert "unsupported" in str(exc_info.value).lower()
     
-    def test_get_stats(self, loader, fixtures_dir):
+    def test_get_stats(self, fixtures_dir):
         """Test loading statistics."""
+        loader = DictionaryLoader(strict_validation=True)
         csv_path = fixtures_dir / "services_v1.0.csv"
         services, version = loader.load(csv_path)
         
@@ -155,22 +236,13 @@ class TestDictionaryLoader:
     
     def test_load_from_dataframe(self, loader):
         """Test loading from DataFrame."""
-        df = pd.DataFrame([
-            {
-                'code': 'TEST001',
-                'name': 'Test Service',
-                'category': 'Testing',
-                'subcategory': 'Unit Tests',
-                'synonyms': 'test,testing'
-            },
-            {
-                'code': 'TEST002',
-                'name': 'Another Test',
-                'category': 'Testing',
-                'subcategory': '',
-                'synonyms': ''
-            }
-        ])
+        df = pd.DataFrame({
+            'code': ['TEST001', 'TEST002'],
+            'name': ['Test Service', 'Another Test'],
+            'category': ['Testing', 'Testing'],
+            'subcategory': ['Unit Tests', ''],
+            'synonyms': ['test,testing', '']
+        })
         
         services, version = loader.load_from_dataframe(df, version="test")
         
@@ -181,25 +253,26 @@ class TestDictionaryLoader:
     
     def test_optional_subcategory(self, loader):
         """Test that subcategory is optional."""
-        df = pd.DataFrame([
-            {
-                'code': 'TEST001',
-                'name': 'Test Service',
-                'category': 'Testing'
-            }
-        ])
+        df = pd.DataFrame({
+            'code': ['TEST001'],
+            'name': ['Test Service'],
+            'category': ['Testing']
+        })
         
         services, _ = loader.load_from_dataframe(df)
         
         assert len(services) == 1
         assert services[0].subcategory is None
     
-    def test_to_search_text(self, loader, fixtures_dir):
-        """Test that loaded services have working to_search_text method."""
-        csv_path = fixtures_dir / "services_v1.0.csv"
-        services, _ = loader.load(csv_path)
-        
-        service = services[0]
+    def test_to_search_text(self):
+        """Test that services have working to_search_text method."""
+        service = ServiceEntry(
+            code="KAR001",
+            name="Konsultacja kardiologiczna",
+            category="Kardiologia",
+            subcategory="Konsultacje",
+            synonyms=["wizyta"]
+        )
         search_text = service.to_search_text()
         
         assert service.code in search_text
@@ -210,11 +283,6 @@ class TestDictionaryLoader:
 class TestConvenienceFunction:
     """Tests for load_dictionary convenience function."""
     
-    @pytest.fixture
-    def fixtures_dir(self):
-        """Get fixtures directory."""
-        return Path(__file__).parent / "fixtures"
-    
     def test_load_dictionary(self, fixtures_dir):
         """Test convenience function."""
         csv_path = fixtures_dir / "services_v1.0.csv"
@@ -236,93 +304,114 @@ class TestConvenienceFunction:
 class TestColumnMapping:
     """Tests for custom column mapping."""
     
-    def test_custom_column_names(self, tmp_path):
+    def test_custom_column_names(self, loader, polish_col_csv):
         """Test loading with custom column names."""
-        # Create CSV with Polish column names
-        csv_file = tmp_path / "services_pl.csv"
-        csv_file.write_text(
-            "kod,nazwa,kategoria,podkategoria,synonimy\n"
-            "KAR001,Konsultacja,Kardiologia,Konsultacje,wizyta\n",
-            encoding='utf-8'
-        )
-        
-        loader = DictionaryLoader()
-        services, _ = loader.load(csv_file)
+        services, _ = loader.load(polish_col_csv)
         
         assert len(services) == 1
         assert services[0].code == "KAR001"
         assert services[0].name == "Konsultacja"
     
-    def test_missing_required_column(self, tmp_path):
+    def test_missing_required_column(self, loader, invalid_csv):
         """Test error when required column is missing."""
-        csv_file = tmp_path / "invalid.csv"
-        csv_file.write_text(
-            "some_col,another_col\n"
-            "value1,value2\n"
-        )
-        
-        loader = DictionaryLoader()
         with pytest.raises(DictionaryLoadError) as exc_info:
-            loader.load(csv_file)
+            loader.load(invalid_csv)
         
         assert "missing" in str(exc_info.value).lower()
 
 
+VERSION_PATTERN_CASES = [
+    ("services_v1.0.csv", "1.0"),
+    ("services_v2.5.1.csv", "2.5.1"),
+    ("services_1.2.csv", "1.2"),
+    ("dict_v3.csv", "3"),
+    ("services.csv", "1.0"),  # Default
+]
+
+
 class TestVersionDetection:
     """Tests for version detection."""
     
-    def test_version_patterns(self):
+    @pytest.mark.parametrize("filename,expected_version", VERSION_PATTERN_CASES)
+    def test_version_patterns(self, loader, filename, expected_version):
         """Test various version patterns in filenames."""
-        loader = DictionaryLoader()
-        
-        test_cases = [
-            ("services_v1.0.csv", "1.0"),
-            ("services_v2.5.1.csv", "2.5.1"),
-            ("services_1.2.csv", "1.2"),
-            ("dict_v3.csv", "3"),
-            ("services.csv", "1.0"),  # Default
-        ]
-        
-        for filename, expected_version in test_cases:
-            file_path = Path(filename)
-            detected = loader._detect_version(file_path)
-            assert detected == expected_version, f"Failed for {filename}"
+        assert loader._detect_version(Path(filename)) == expected_version
 
 
 class TestLargeDataset:
     """Tests for handling large datasets."""
     
-    def test_load_many_rows(self, tmp_path):
+    @pytest.mark.slow
+    def test_load_many_rows(self, loader, large_csv):
         """Test loading thousands of rows efficiently."""
-        # Create CSV with 5000 rows
-        csv_file = tmp_path / "large_services.csv"
+        services, _ = loader.load(large_csv)
         
-        with open(csv_file, 'w', encoding='utf-8') as f:
-            f.write("code,name,category,subcategory,synonyms\n")
-            for i in range(5000):
-                f.write(f"SVC{i:05d},Service {i},Category {i % 10},Subcat,synonym{i}\n")
+        assert len(services) == 5000
+        assert services[0].code == "SVC00000"
+        assert services[-1].code == "SVC04999"
+    
+    @pytest.mark.slow
+    @pytest.mark.parametrize("engine", ["c", "pyarrow"])
+    def test_load_many_rows_engines(self, loader, large_csv, engine):
+        """Test that the CSV parser engine can be chosen."""
+        if engine == "pyarrow":
+            pytest.importorskip("pyarrow")
         
-        loader = DictionaryLoader()
-        services, _ = loader.load(csv_file)
+        services, _ = loader.load(large_csv, engine=engine)
         
         assert len(services) == 5000
-        assert services[0].code == "SVC00000"
         assert services[-1].code == "SVC04999"
     
-    def test_memory_efficiency(self, tmp_path):
-        """Test that loading is memory efficient (no duplicate storage)."""
-        csv_file = tmp_path / "services.csv"
+    @pytest.mark.slow
+    @pytest.mark.parametrize("chunksize", [512, 1024, 2048])
+    def test_chunked_equals_full(self, loader, large_csv, large_services, chunksize):
+        """Test that chunked CSV reading gives the same services."""
+        chunked, _ = loader.load(large_csv, chunksize=chunksize)
+        
+        assert chunked == large_services
+    
+    def test_chunked_duplicates_across_chunks(self, tmp_path):
+        """Test that duplicate codes in different chunks are detected."""
+        csv_file = tmp_path / "dups.csv"
         csv_file.write_text(
             "code,name,category\n"
             "SVC001,Service 1,Cat1\n"
-            "SVC002,Service 2,Cat2\n"
+            "SVC002,Service 2,Cat1\n"
+            "SVC001,Service 1 again,Cat1\n"
         )
         
-        loader = DictionaryLoader()
-        services, _ = loader.load(csv_file)
+        with pytest.raises(DictionaryLoadError, match="duplicate"):
+            _make_loader(True).load(csv_file, chunksize=2)
+        
+        services, _ = _make_loader(False).load(csv_file, chunksize=2)
+        assert [(s.code, s.name) for s in services] == [
+            ("SVC001", "Service 1"), ("SVC002", "Service 2"),
+        ]
+    
+    def test_chunksize_unsupported_by_engine(self, loader, small_services_csv):
+        """Test that an invalid engine/option combination is reported as such."""
+        with pytest.raises(DictionaryLoadError, match="chunksize"):
+            loader.load(small_services_csv, engine="pyarrow", chunksize=1)
+    
+    @pytest.mark.slow
+    def test_category_interning(self, large_services):
+        """Test that repeated category strings are shared between services."""
+        services = large_services
+        
+        assert len({s.category for s in services}) == 10
+        # "Category {i % 10}" repeats every 10 rows
+        for i, service in enumerate(services[:20]):
+            assert service.category is services[i % 10].category
+        assert len({id(s.category) for s in services}) == 10
+        assert len({id(s.subcategory) for s in services}) == 1
+    
+    def test_memory_efficiency(self, loader, small_services_csv):
+        """Test that loading is memory efficient (no duplicate storage)."""
+        services, _ = loader.load(small_services_csv)
         
-        # Verify each service is a separate object
-        assert id(services[0]) != id(services[1])
+        # Category strings are interned, not a fresh copy per row
+        assert services[0].category is sys.intern("Cat1")
+        assert services[1].category is sys.intern("Cat2")
         
         # Verify we can access all services
         codes = [s.code for s in services]
@@ -0,0 +1,51 @@
+"""Tests for logging setup."""
+
+import logging
+
+import pytest
+
+from siwz_mapper.utils import logging as logging_module
+from siwz_mapper.utils import setup_logging
+
+
+@pytest.fixture
+def root_logger():
+    """Root logger, with setup_logging's handlers removed and its level restored afterwards."""
+    root = logging.getLogger()
+    level = root.level
+    yield root
+    logging_module._teardown_logging()
+    root.setLevel(level)
+
+
+def test_reconfigure_replaces_own_handlers(root_logger, tmp_path):
+    """Test that a new configuration replaces (and closes) the previous one."""
+    foreign = logging.NullHandler()
+    root_logger.addHandler(foreign)
+    try:
+        setup_logging("INFO", tmp_path / "first.log")
+        first_handlers = list(logging_module._HANDLERS)
+        first_listener = logging_module._LISTENER
+
+        setup_logging("DEBUG", tmp_path / "second.log")
+        logging.getLogger("siwz_test").debug("second run")
+
+        assert foreign in root_logger.handlers
+        assert not any(h in root_logger.handlers for h in first_handlers)
+        assert first_listener._thread is None  # stopped
+
+        logging_module._teardown_logging()  # drain the queue, close the file
+        assert foreign in root_logger.handlers
+        assert "second run" in (tmp_path / "second.log").read_text(encoding="utf-8")
+    finally:
+        root_logger.removeHandler(foreign)
+
+
+def test_repeat_call_is_noop(root_logger):
+    """Test that calling again with the same arguments installs nothing new."""
+    setup_logging("WARNING")
+    handlers = list(root_logger.handlers)
+
+    setup_logging("warning")
+
+    assert root_logger.handlers == handlers
@@ -1,129 +1,121 @@
 """Tests for text normalizer."""
 
-import pytest
-from pathlib import Path
-import sys
+import unicodedata
+from types import SimpleNamespace
 
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+import pytest
 
 from siwz_mapper.preprocess import TextNormalizer, normalize_text
+from siwz_mapper.preprocess import normalizer as normalizer_module
+
+
+@pytest.fixture(scope="module")
+def normalizer():
+    """Default-options TextNormalizer shared across a module."""
+    return TextNormalizer()
+
+
+HYPHEN_CASES = [
+    ("dodat-\nkowy", "dodatkowy"),
+    ("konsul-\ntacja", "konsultacja"),
+    ("medycz-\nnych", "medycznych"),
+    ("dodatko-\nwy", "dodatkowy"),
+    ("konsul-\r\ntacja", "konsultacja"),  # CRLF line ending
+]
 
 
 class TestTextNormalizer:
     """Tests for TextNormalizer class."""
     
-    def test_initialization(self):
+    def test_initialization(self, normalizer):
         """Test normalizer initialization."""
-        normalizer = TextNormalizer()
         assert normalizer.normalize_unicode is True
         assert normalizer.fix_whitespace is True
         assert normalizer.fix_hyphenation is True
     
-    def test_unicode_normalization(self):
+    def test_unicode_normalization(self, normalizer):
         """Test Unicode NFC normalization."""
-        normalizer = TextNormalizer()
-        
         # Composed vs decomposed forms
         text = "café"  # May be decomposed
         normalized = normalizer.normalize(text)
         assert normalized == "café"
     
-    def test_whitespace_cleanup(self):
-        """Test whitespace cleanup."""
-        normalizer = TextNormalizer()
+    def test_nfc_fast_path(self, normalizer, monkeypatch):
+        """Test that already-NFC text skips unicodedata.normalize."""
+        assert normalizer.normalize("cafe\u0301") == "caf\u00e9"
+        
+        def fail(*args):
+            raise AssertionError("normalize called on NFC text")
         
+        # Patch only the normalizer module's view of unicodedata
+        fake = SimpleNamespace(is_normalized=unicodedata.is_normalized, normalize=fail)
+        monkeypatch.setattr(normalizer_module, "unicodedata", fake)
+        assert normalizer.normalize("caf\u00e9") == "caf\u00e9"
+    
+    def test_whitespace_cleanup(self, normalizer):
+        """Test whitespace cleanup."""
         text = "tekst  z    wieloma     spacjami"
         normalized = normalizer.normalize(text)
         assert normalized == "tekst z wieloma spacjami"
     
-    def test_multiple_newlines(self):
+    def test_multiple_newlines(self, normalizer):
         """Test multiple newlines cleanup."""
-        normalizer = TextNormalizer()
-        
         text = "linia 1\n\n\n\nlinia 2"
         normalized = normalizer.normalize(text)
         assert normalized == "linia 1\n\nlinia 2"
     
-    def test_tab_replacement(self):
+    def test_tab_replacement(self, normalizer):
         """Test tab to space conversion."""
-        normalizer = TextNormalizer()
-        
         text = "kolumna1\tkolumna2\tkolumna3"
         normalized = normalizer.normalize(text)
         assert "\t" not in normalized
         assert "kolumna1" in normalized
     
-    def test_hyphenation_fix(self):
-        """Test line-end hyphenation removal."""
-        normalizer = TextNormalizer()
-        
-        text = "dodat-\nkowy"
-        normalized = normalizer.normalize(text)
-        assert normalized == "dodatkowy"
-        
-        text = "konsul-\ntacja"
-        normalized = normalizer.normalize(text)
-        assert normalized == "konsultacja"
-    
-    def test_smart_quotes_normalization(self):
+    @pytest.mark.parametrize("text,expected", HYPHEN_CASES)
+    def test_hyphenation_fix(self, normalizer, text, expected):
+        """Test line-end hyphenation removal (incl. Polish words)."""
+        assert normalizer.normalize(text) == expected
+    
+    @pytest.mark.parametrize("text,expected", [
+        ("\u201ccytat\u201d i \u2018inny\u2019", "\"cytat\" i 'inny'"),  # smart double/single
+        ("\u201epolski cytat\u201d", "\"polski cytat\""),  # Polish „...”
+        ("\u201aniski\u201b", "'niski'"),  # low/reversed single quotes
+        ("bez cudzysłowów", "bez cudzysłowów"),
+    ])
+    def test_smart_quotes_normalization(self, normalizer, text, expected):
         """Test smart quotes conversion."""
-        normalizer = TextNormalizer()
-        
-        # Smart quotes (using Unicode escapes to avoid syntax errors)
-        text = "\u201ccytat\u201d i \u2018inny\u2019"  # "cytat" i 'inny'
-        normalized = normalizer.normalize(text)
-        # Check that smart quotes are replaced with straight quotes
-        assert '\u201c' not in normalized  # No left smart double quote
-        assert '\u201d' not in normalized  # No right smart double quote
-        assert '\u2018' not in normalized  # No left smart single quote
-        assert '\u2019' not in normalized  # No right smart single quote
-        assert 'cytat' in normalized
-        assert 'inny' in normalized
-        # Verify straight quotes are present
-        assert normalized.count('"') == 2  # Two straight double quotes
-        assert normalized.count("'") == 2  # Two straight single quotes
-        
-        # Polish quotes
-        text = "\u201epolski cytat\u201d"  # „polski cytat"
-        normalized = normalizer.normalize(text)
-        assert '\u201e' not in normalized  # No Polish opening quote
-        assert 'polski cytat' in normalized
+        assert normalizer.normalize(text) == expected
     
-    def test_invisible_chars_removal(self):
+    def test_invisible_chars_removal(self, normalizer):
         """Test removal of invisible characters."""
-        normalizer = TextNormalizer()
-        
         # Zero-width space
         text = "tekst\u200bz\u200binwizybilnymi"
         normalized = normalizer.normalize(text)
         assert '\u200b' not in normalized
         assert normalized == "tekstzinwizybilnymi"
     
-    def test_leading_trailing_whitespace(self):
+    def test_leading_trailing_whitespace(self, normalizer):
         """Test removal of leading/trailing whitespace."""
-        normalizer = TextNormalizer()
-        
         text = "  tekst  \n  druga linia  "
         normalized = normalizer.normalize(text)
         assert normalized == "tekst\ndruga linia"
     
-    def test_bullet_detection(self):
-        """Test bullet point detection."""
-        normalizer = TextNormalizer()
-        
+    @pytest.mark.parametrize("text,expected", [
         # Various bullet characters
-        assert normalizer.is_bullet_point("• Pierwszy punkt")
-        assert normalizer.is_bullet_point("- drugi punkt")
-        assert normalizer.is_bullet_point("* trzeci punkt")
-        
+        ("• Pierwszy punkt", True),
+        ("- drugi punkt", True),
+        ("* trzeci punkt", True),
         # Numbered bullets
-        assert normalizer.is_bullet_point("1. pierwszy")
-        assert normalizer.is_bullet_point("2) drugi")
-        assert normalizer.is_bullet_point("a) litera")
-        
+        ("1. pierwszy", True),
+        ("2) drugi", True),
+        ("a) litera", True),
         # Not bullets
-        assert not normalizer.is_bullet_point("Zwykły tekst")
-        assert not normalizer.is_bullet_point("")
+        ("Zwykły tekst", False),
+        ("", False),
+    ])
+    def test_bullet_detection(self, normalizer, text, expected):
+        """Test bullet point detection."""
+        assert normalizer.is_bullet_point(text) is expected
     
     def test_disable_options(self):
         """Test disabling normalization options."""
@@ -139,10 +131,8 @@ class TestTextNormalizer:
         # Should be mostly unchanged (only invisible chars removed)
         assert "  " in normalized  # Multiple spaces preserved
     
-    def test_empty_text(self):
+    def test_empty_text(self, normalizer):
         """Test normalization of empty text."""
-        normalizer = TextNormalizer()
-        
         assert normalizer.normalize("") == ""
         assert normalizer.normalize(None) == None
 
@@ -174,23 +164,8 @@ class TestConvenienceFunction:
 class TestPolishText:
     """Tests for Polish-specific text."""
     
-    def test_polish_characters(self):
+    def test_polish_characters(self, normalizer):
         """Test Polish characters are preserved."""
-        normalizer = TextNormalizer()
-        
         text = "ąćęłńóśźż ĄĆĘŁŃÓŚŹŻ"
         normalized = normalizer.normalize(text)
         assert normalized == text
-    
-    def test_polish_hyphenation(self):
-        """Test Polish word hyphenation."""
-        normalizer = TextNormalizer()
-        
-        text = "medycz-\nnych"
-        normalized = normalizer.normalize(text)
-        assert normalized == "medycznych"
-        
-        # Test with another Polish word
-        text = "dodatko-\nwy"
-        normalized = normalizer.normalize(text)
-        assert normalized == "dodatkowy"
@@ -1,27 +1,80 @@
 """Tests for PDF loader."""
 
+import os
 import pytest
 from pathlib import Path
-from unittest.mock import Mock, patch, MagicMock
-import sys
-
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from unittest.mock import MagicMock
 
 from siwz_mapper.io import PDFLoader, PDFLoadError
+from siwz_mapper.io import pdf_loader
 from siwz_mapper.io.pdf_loader import load_pdf
 from siwz_mapper.models import PdfSegment, BBox
 
 
-# Mock fitz module for all tests
-@pytest.fixture(autouse=True)
-def mock_fitz_module():
-    """Mock PyMuPDF module globally."""
-    # Create a mock fitz module
-    mock_fitz_mod = MagicMock()
+class FakePage:
+    """Stand-in for fitz.Page returning fixed get_text() output."""
+    
+    def __init__(self, blocks):
+        self.blocks = blocks
+        self.calls = 0
+    
+    def get_text(self, *args, **kwargs):
+        self.calls += 1
+        return self.blocks
+
+
+class MockDoc:
+    """Stand-in for fitz.Document over a list of FakePages."""
+    
+    def __init__(self):
+        self.pages = []
+        self.closed = False
     
-    # Patch it into sys.modules so imports work
-    with patch.dict('sys.modules', {'fitz': mock_fitz_mod}):
-        yield mock_fitz_mod
+    def set_blocks(self, *pages_blocks):
+        """Set one get_text() result per page; returns the pages."""
+        self.pages = [FakePage(blocks) for blocks in pages_blocks]
+        return self.pages
+    
+    def __len__(self):
+        return len(self.pages)
+    
+    def __iter__(self):
+        return iter(self.pages)
+    
+    def __getitem__(self, idx):
+        return self.pages[idx]
+    
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture(scope="module")
+def shared_fitz():
+    """One MagicMock standing in for the fitz module, reused by every test."""
+    return MagicMock()
+
+
+@pytest.fixture
+def mock_fitz(shared_fitz, monkeypatch):
+    """Patch pdf_loader.fitz with the shared mock, reset to a fresh empty MockDoc."""
+    shared_fitz.reset_mock(return_value=True, side_effect=True)
+    shared_fitz.open.return_value = MockDoc()
+    monkeypatch.setattr(pdf_loader, "fitz", shared_fitz)
+    return shared_fitz
+
+
+@pytest.fixture
+def mock_doc(mock_fitz):
+    """The MockDoc returned by the patched fitz.open."""
+    return mock_fitz.open.return_value
+
+
+@pytest.fixture
+def dummy_pdf(tmp_path):
+    """Placeholder PDF file; its content is only passed to the mocked fitz.open."""
+    pdf_path = tmp_path / "dummy.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 fake")
+    return pdf_path
 
 
 class TestPDFLoader:
@@ -46,56 +99,36 @@ class TestPDFLoader:
         assert loader.merge_consecutive_blocks is True
         assert loader.min_block_length == 5
     
-    @patch('siwz_mapper.io.pdf_loader.fitz')
-    @patch('pathlib.Path.exists')
-    def test_load_pdf_mock(self, mock_exists, mock_fitz):
+    def test_load_pdf_mock(self, mock_doc, dummy_pdf):
         """Test loading PDF with mocked fitz."""
-        # Mock file existence
-        mock_exists.return_value = True
-        
-        # Create mock page with text blocks
-        mock_page = Mock()
-        mock_page.get_text.return_value = [
+        mock_doc.set_blocks([
             # (x0, y0, x1, y1, text, block_no, block_type)
             (50, 100, 400, 120, "First paragraph text.\n", 0, 0),
             (50, 140, 400, 160, "Second paragraph text.\n", 1, 0),
-        ]
-        
-        # Create mock document with proper __len__ support
-        mock_doc = Mock()
-        mock_doc.__len__ = Mock(return_value=1)
-        mock_doc.configure_mock(**{'__len__.return_value': 1})
-        mock_doc.__getitem__ = Mock(return_value=mock_page)
-        mock_doc.__iter__ = Mock(return_value=iter([mock_page]))
-        mock_doc.close = Mock()
-        
-        # Setup fitz.open to return mock document
-        mock_fitz.open.return_value = mock_doc
+        ])
         
-        # Create loader and load
         loader = PDFLoader()
-        
-        # Create a temporary file path (doesn't need to exist with mock)
-        segments = loader.load(Path("dummy.pdf"))
+        segments = loader.load(dummy_pdf)
         
         # Verify segments were created
         assert len(segments) == 2
         assert all(isinstance(seg, PdfSegment) for seg in segments)
         assert segments[0].page == 1
         assert "First paragraph" in segments[0].text
+        
+        # Without cache_documents the document is closed after loading
+        assert mock_doc.closed
     
     def test_extract_page_segments(self):
         """Test extracting segments from a page."""
-        # Create mock page
-        mock_page = Mock()
-        mock_page.get_text.return_value = [
+        page = FakePage([
             (50, 100, 400, 120, "Text block 1\n", 0, 0),
             (50, 140, 400, 160, "Text block 2\n", 1, 0),
             (50, 180, 400, 200, "   \n", 2, 0),  # Empty (whitespace only)
-        ]
+        ])
         
         loader = PDFLoader(extract_bboxes=True)
-        segments = loader._extract_page_segments(mock_page, 1, 0)
+        segments = loader._extract_page_segments(page, 1, 0)
         
         # Should skip empty block
         assert len(segments) == 2
@@ -108,28 +141,25 @@ class TestPDFLoader:
         """Test filtering blocks by minimum length."""
         loader = PDFLoader(min_block_length=10)
         
-        # Mock page with short and long blocks
-        mock_page = Mock()
-        mock_page.get_text.return_value = [
+        page = FakePage([
             (50, 100, 100, 120, "Hi", 0, 0),  # Too short
             (50, 140, 400, 160, "This is a longer text block", 1, 0),  # OK
-        ]
+        ])
         
-        segments = loader._extract_page_segments(mock_page, 1, 0)
+        segments = loader._extract_page_segments(page, 1, 0)
         
         assert len(segments) == 1
         assert "longer text" in segments[0].text
     
     def test_bbox_extraction(self):
         """Test bounding box extraction."""
-        mock_page = Mock()
-        mock_page.get_text.return_value = [
+        page = FakePage([
             (50.5, 100.2, 400.8, 120.9, "Test text", 0, 0),
-        ]
+        ])
         
         # With bboxes
         loader = PDFLoader(extract_bboxes=True)
-        segments = loader._extract_page_segments(mock_page, 1, 0)
+        segments = loader._extract_page_segments(page, 1, 0)
         
         assert segments[0].bbox is not None
         assert segments[0].bbox.x0 == 50.5
@@ -140,20 +170,19 @@ class TestPDFLoader:
         
         # Without bboxes
         loader_no_bbox = PDFLoader(extract_bboxes=False)
-        segments_no_bbox = loader_no_bbox._extract_page_segments(mock_page, 1, 0)
+        segments_no_bbox = loader_no_bbox._extract_page_segments(page, 1, 0)
         
         assert segments_no_bbox[0].bbox is None
     
     def test_character_offsets(self):
         """Test character offset calculation."""
-        mock_page = Mock()
-        mock_page.get_text.return_value = [
+        page = FakePage([
             (50, 100, 400, 120, "First block", 0, 0),   # 11 chars
             (50, 140, 400, 160, "Second block", 1, 0),  # 12 chars
-        ]
+        ])
         
         loader = PDFLoader()
-        segments = loader._extract_page_segments(mock_page, 1, 0)
+        segments = loader._extract_page_segments(page, 1, 0)
         
         # First block
         assert segments[0].start_char == 0
@@ -163,7 +192,6 @@ class TestPDFLoader:
         assert segments[1].start_char == 12
         assert segments[1].end_char == 24
     
-    @patch('siwz_mapper.io.pdf_loader.fitz')
     def test_file_not_found(self, mock_fitz):
         """Test error when PDF file doesn't exist."""
         loader = PDFLoader()
@@ -173,7 +201,13 @@ class TestPDFLoader:
         
         assert "not found" in str(exc_info.value).lower()
     
-    @patch('siwz_mapper.io.pdf_loader.fitz')
+    def test_inaccessible_path(self, mock_fitz, dummy_pdf):
+        """Test that other OS errors on the path are reported as PDFLoadError."""
+        loader = PDFLoader()
+        
+        with pytest.raises(PDFLoadError):
+            loader.load(dummy_pdf / "not_a_dir.pdf")  # NotADirectoryError
+    
     def test_invalid_pdf(self, mock_fitz):
         """Test error when PDF cannot be opened."""
         mock_fitz.open.side_effect = Exception("Invalid PDF")
@@ -185,27 +219,11 @@ class TestPDFLoader:
         
         assert "failed to open" in str(exc_info.value).lower()
     
-    @patch('siwz_mapper.io.pdf_loader.fitz')
-    def test_load_from_bytes(self, mock_fitz):
+    def test_load_from_bytes(self, mock_fitz, mock_doc):
         """Test loading PDF from bytes."""
-        mock_page = Mock()
-        mock_page.get_text.return_value = [
+        mock_doc.set_blocks([
             (50, 100, 400, 120, "Test text", 0, 0),
-        ]
-        
-        # Create mock document with __len__ support
-        class MockDoc:
-            def __len__(self):
-                return 1
-            def __getitem__(self, idx):
-                return mock_page
-            def __iter__(self):
-                return iter([mock_page])
-            def close(self):
-                pass
-        
-        mock_doc = MockDoc()
-        mock_fitz.open.return_value = mock_doc
+        ])
         
         loader = PDFLoader()
         pdf_bytes = b"fake pdf content"
@@ -220,128 +238,127 @@ class TestPDFLoader:
         call_kwargs = mock_fitz.open.call_args[1]
         assert call_kwargs['filetype'] == 'pdf'
     
-    @patch('siwz_mapper.io.pdf_loader.fitz')
-    def test_get_page_count(self, mock_fitz):
+    def test_get_page_count(self, mock_fitz, mock_doc, dummy_pdf):
         """Test getting page count."""
-        class MockDoc:
-            def __len__(self):
-                return 5
-            def close(self):
-                pass
-        
-        mock_fitz.open.return_value = MockDoc()
+        mock_doc.set_blocks(*[[]] * 5)
         
         loader = PDFLoader()
-        count = loader.get_page_count(Path("dummy.pdf"))
+        count = loader.get_page_count(dummy_pdf)
         
         assert count == 5
+        # Without caching the file is opened by path, not read into memory
+        mock_fitz.open.assert_called_once_with(dummy_pdf)
+        assert mock_doc.closed
     
-    @patch('siwz_mapper.io.pdf_loader.fitz')
-    def test_extract_page_text(self, mock_fitz):
+    def test_extract_page_text(self, mock_doc, dummy_pdf):
         """Test extracting text from single page."""
-        mock_page = Mock()
-        mock_page.get_text.return_value = "Page text content"
-        
-        class MockDoc:
-            def __len__(self):
-                return 3
-            def __getitem__(self, idx):
-                return mock_page
-            def close(self):
-                pass
-        
-        mock_doc = MockDoc()
-        mock_fitz.open.return_value = mock_doc
+        mock_doc.set_blocks("", "Page text content", "")
         
         loader = PDFLoader()
-        text = loader.extract_page_text(Path("dummy.pdf"), page_num=2)
+        text = loader.extract_page_text(dummy_pdf, page_num=2)
         
         assert text == "Page text content"
     
-    @patch('siwz_mapper.io.pdf_loader.fitz')
-    def test_extract_page_text_invalid_page(self, mock_fitz):
+    def test_extract_page_text_invalid_page(self, mock_doc, dummy_pdf):
         """Test error for invalid page number."""
-        class MockDoc:
-            def __len__(self):
-                return 3
-            def close(self):
-                pass
-        
-        mock_fitz.open.return_value = MockDoc()
+        mock_doc.set_blocks(*[[]] * 3)
         
         loader = PDFLoader()
         
         with pytest.raises(PDFLoadError) as exc_info:
-            loader.extract_page_text(Path("dummy.pdf"), page_num=5)
+            loader.extract_page_text(dummy_pdf, page_num=5)
         
         assert "invalid page" in str(exc_info.value).lower()
     
-    @patch('siwz_mapper.io.pdf_loader.fitz')
-    @patch('pathlib.Path.exists')
-    def test_multiple_pages(self, mock_exists, mock_fitz):
+    def test_document_reused_across_calls(self, mock_fitz, mock_doc, dummy_pdf):
+        """Test that one open document serves load, page count and page text."""
+        mock_doc.set_blocks([(50, 100, 400, 120, "Page 1 text", 0, 0)])
+        
+        with PDFLoader(cache_documents=True) as loader:
+            assert loader.get_page_count(dummy_pdf) == 1
+            loader.load(dummy_pdf)
+            loader.extract_page_text(dummy_pdf, page_num=1)
+            assert not mock_doc.closed
+        
+        mock_fitz.open.assert_called_once()
+        assert mock_doc.closed
+    
+    def test_cached_document_reopened_after_rewrite(self, mock_fitz, mock_doc, dummy_pdf):
+        """Test that a file rewritten within the same mtime tick is opened again."""
+        mock_doc.set_blocks([(50, 100, 400, 120, "Page 1 text", 0, 0)])
+        st = dummy_pdf.stat()
+        
+        with PDFLoader(cache_documents=True) as loader:
+            loader.load(dummy_pdf)
+            dummy_pdf.write_bytes(b"%PDF-1.4 rewritten")
+            os.utime(dummy_pdf, ns=(st.st_atime_ns, st.st_mtime_ns))
+            loader.load(dummy_pdf)
+        
+        assert mock_fitz.open.call_count == 2
+    
+    def test_multiple_pages(self, mock_doc, dummy_pdf):
         """Test loading PDF with multiple pages."""
-        mock_exists.return_value = True
-        
-        # Create mock pages
-        mock_page1 = Mock()
-        mock_page1.get_text.return_value = [
-            (50, 100, 400, 120, "Page 1 text", 0, 0),
-        ]
-        
-        mock_page2 = Mock()
-        mock_page2.get_text.return_value = [
-            (50, 100, 400, 120, "Page 2 text", 0, 0),
-        ]
-        
-        class MockDoc:
-            def __len__(self):
-                return 2
-            def __iter__(self):
-                return iter([mock_page1, mock_page2])
-            def __getitem__(self, idx):
-                return [mock_page1, mock_page2][idx]
-            def close(self):
-                pass
-        
-        mock_fitz.open.return_value = MockDoc()
+        mock_doc.set_blocks(
+            [(50, 100, 400, 120, "Page 1 text", 0, 0)],
+            [(50, 100, 400, 120, "Page 2 text", 0, 0)],
+        )
         
         loader = PDFLoader()
-        segments = loader.load(Path("dummy.pdf"))
+        segments = loader.load(dummy_pdf)
         
         assert len(segments) == 2
         assert segments[0].page == 1
         assert segments[1].page == 2
         assert "Page 1" in segments[0].text
         assert "Page 2" in segments[1].text
+    
+    def test_max_pages(self, mock_doc, dummy_pdf):
+        """Test that extraction stops after max_pages pages."""
+        pages = mock_doc.set_blocks(*(
+            [(50, 100, 400, 120, f"Page {i + 1} text", 0, 0)] for i in range(3)
+        ))
+        
+        loader = PDFLoader()
+        segments = loader.load(dummy_pdf, max_pages=2)
+        
+        assert [s.page for s in segments] == [1, 2]
+        assert pages[2].calls == 0
+    
+    def test_parallel_matches_serial(self, tmp_path):
+        """Test that process-pool extraction gives the same segments."""
+        from siwz_mapper.io import pdf_loader
+        real_fitz = pdf_loader._get_fitz()
+        
+        doc = real_fitz.open()
+        for i in range(5):
+            page = doc.new_page()
+            page.insert_text((50, 72), f"Strona {i + 1}: konsultacja", fontsize=11)
+            page.insert_text((50, 300), f"Wariant {i + 1}", fontsize=11)
+        pdf_path = tmp_path / "pages.pdf"
+        doc.save(pdf_path)
+        doc.close()
+        
+        serial = PDFLoader().load(pdf_path)
+        
+        loader = PDFLoader(max_workers=2)
+        loader.PARALLEL_MIN_PAGES = 2
+        loader.PAGES_PER_TASK = 2
+        parallel = loader.load(pdf_path)
+        
+        assert len(serial) == 10
+        assert parallel == serial
 
 
 class TestConvenienceFunction:
     """Tests for load_pdf convenience function."""
     
-    @patch('siwz_mapper.io.pdf_loader.fitz')
-    @patch('pathlib.Path.exists')
-    def test_load_pdf(self, mock_exists, mock_fitz):
+    def test_load_pdf(self, mock_doc, dummy_pdf):
         """Test convenience function."""
-        mock_exists.return_value = True
-        
-        mock_page = Mock()
-        mock_page.get_text.return_value = [
+        mock_doc.set_blocks([
             (50, 100, 400, 120, "Test content", 0, 0),
-        ]
+        ])
         
-        class MockDoc:
-            def __len__(self):
-                return 1
-            def __getitem__(self, idx):
-                return mock_page
-            def __iter__(self):
-                return iter([mock_page])
-            def close(self):
-                pass
-        
-        mock_fitz.open.return_value = MockDoc()
-        
-        segments = load_pdf(Path("dummy.pdf"))
+        segments = load_pdf(dummy_pdf)
         
         assert len(segments) == 1
         assert isinstance(segments[0], PdfSegment)
@@ -350,31 +367,14 @@ class TestConvenienceFunction:
 class TestSegmentStructure:
     """Tests for PdfSegment structure suitability."""
     
-    @patch('siwz_mapper.io.pdf_loader.fitz')
-    @patch('pathlib.Path.exists')
-    def test_segment_has_citation_info(self, mock_exists, mock_fitz):
+    def test_segment_has_citation_info(self, mock_doc, dummy_pdf):
         """Test that segments contain all info needed for citation."""
-        mock_exists.return_value = True
-        
-        mock_page = Mock()
-        mock_page.get_text.return_value = [
+        mock_doc.set_blocks([
             (50, 100, 400, 120, "Cited text block", 0, 0),
-        ]
-        
-        class MockDoc:
-            def __len__(self):
-                return 1
-            def __iter__(self):
-                return iter([mock_page])
-            def __getitem__(self, idx):
-                return mock_page
-            def close(self):
-                pass
-        
-        mock_fitz.open.return_value = MockDoc()
+        ])
         
         loader = PDFLoader(extract_bboxes=True)
-        segments = loader.load(Path("dummy.pdf"))
+        segments = loader.load(dummy_pdf)
         
         segment = segments[0]
         
@@ -419,4 +419,3 @@ class TestSegmentStructure:
         citation = f'"{segment.text}" (page {segment.page}, chars {segment.start_char}-{segment.end_char})'
         assert 'page 1' in citation
         assert 'chars 0-16' in citation
-
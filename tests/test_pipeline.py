@@ -1,5 +1,7 @@
 from pathlib import Path
+import io
 import json
+
 import pytest
 
 from siwz_mapper.pipeline import (
@@ -8,37 +10,7 @@ from siwz_mapper.pipeline import (
     Pipeline,
     VariantAggregator,
 )
-from siwz_mapper.config import Config
-from siwz_mapper.models import ServiceEntry, VariantResult, DocumentResult
-
-
-# -----------------------
-# Fixtures (local)
-# -----------------------
-
-@pytest.fixture
-def config():
-    return Config()
-
-
-@pytest.fixture
-def services():
-    return [
-        ServiceEntry(
-            code="SVC001",
-            name="Konsultacja kardiologiczna",
-            category="Kardiologia",
-            subcategory=None,
-            synonyms=[]
-        ),
-        ServiceEntry(
-            code="SVC002",
-            name="USG serca",
-            category="Kardiologia",
-            subcategory=None,
-            synonyms=[]
-        ),
-    ]
+from siwz_mapper.models import VariantResult, DocumentResult
 
 
 # -----------------------
@@ -66,6 +38,16 @@ class TestServiceMapper:
         assert len(mapper.services) == 2
         assert mapper.top_k == 5
 
+    def test_service_index(self, services):
+        mapper = ServiceMapper(services=list(services))
+
+        assert list(mapper.service_index) == ["SVC001", "SVC002"]
+        assert mapper.service_index["SVC002"] is services[1]
+
+        # built once; services can't be swapped out from under it
+        with pytest.raises(AttributeError):
+            mapper.services = services[:1]
+
     def test_map_variants_stub(self, services):
         mapper = ServiceMapper(
             services=services
@@ -98,15 +80,26 @@ class TestPipeline:
         pdf_path = tmp_path / "test.pdf"
         pdf_path.write_bytes(b"dummy")  # niepoprawny PDF -> extractor zwróci stub
 
-        output_path = tmp_path / "output.json"
+        output = io.BytesIO()
 
         result = pipeline.process(
             pdf_path=pdf_path,
-            output_path=output_path
+            output_path=output
         )
 
         assert isinstance(result, DocumentResult)
-        assert output_path.exists()
+
+        data = json.loads(output.getvalue().decode("utf-8"))
+        assert data["doc_id"] == "test"
+
+    def test_process_writes_file(self, config, services, tmp_path):
+        pipeline = Pipeline(config=config, services=services)
+
+        pdf_path = tmp_path / "test.pdf"
+        pdf_path.write_bytes(b"dummy")
+
+        output_path = tmp_path / "out" / "output.json"
+        pipeline.process(pdf_path=pdf_path, output_path=output_path)
 
         data = json.loads(output_path.read_text(encoding="utf-8"))
         assert data["doc_id"] == "test"
@@ -1,28 +1,113 @@
 """Tests for text segmenter."""
 
-import pytest
-from pathlib import Path
-import sys
+from functools import lru_cache
+from typing import Final
+import re
 
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+import pytest
 
 from siwz_mapper.models import PdfSegment, BBox
-from siwz_mapper.preprocess import Segmenter, segment_pdf_blocks
+from siwz_mapper.preprocess import segment_pdf_blocks
+
+
+@lru_cache(maxsize=256)
+def _block(text: str, page: int = 1, segment_id: str = "seg_1") -> PdfSegment:
+    """
+    Plain block without offsets/bbox; shared between tests (PdfSegment is frozen).
+
+    Built with model_construct, skipping validation, so only pass known-valid
+    data (use PdfSegment(...) when testing validation).
+    """
+    return PdfSegment.model_construct(segment_id=segment_id, text=text, page=page)
+
+
+# Inputs, built once for the module (segment() does not modify its input)
+TEXT_BLANK_LINES: Final = "First paragraph text.\n\nSecond paragraph text.\n\nThird paragraph text."
+TEXT_BULLETS: Final = "• First bullet point\n• Second bullet point\n• Third bullet point"
+TEXT_NUMBERED: Final = "1. First item\n2. Second item\n3. Third item"
+TEXT_MIXED: Final = "Regular paragraph text.\n\n• Bullet one\n• Bullet two\n\nAnother paragraph."
+TEXT_TWO_PARAGRAPHS: Final = "First paragraph.\n\nSecond paragraph."
+LONG_PARAGRAPH: Final = "This is a sentence about medical services. " * 30  # ~1260 chars
+LONG_TEST_PARAGRAPH: Final = "This is a test sentence. " * 50  # ~1250 chars
+VERY_LONG_SENTENCE: Final = "This is a very long sentence " * 50 + "."
+NO_SENTENCE_ENDINGS: Final = "text without clear endings and lots of content " * 30
+
+# BBox is frozen, so one instance can be shared by all tests
+SHARED_BBOX: Final = BBox(page=1, x0=50, y0=100, x1=400, y1=120)
+
+ORDINAL_RE: Final = re.compile(r"\b(First|Second|Third)\b")
+ORDINALS: Final = ["First", "Second", "Third"]
+
+# (id, blocks, Segmenter kwargs, min segments, max segments or None,
+#  ordinal words expected in segments[0], segments[1], ... in that order)
+SEGMENT_CASES = [
+    pytest.param(
+        [_block(TEXT_BLANK_LINES)],
+        {}, 3, None, ORDINALS,
+        id="blank_lines",
+    ),
+    pytest.param(
+        [_block(TEXT_BULLETS)],
+        {"detect_bullets": True}, 3, 3, ORDINALS,
+        id="bullet_list",
+    ),
+    pytest.param(
+        [_block(TEXT_NUMBERED)],
+        {"detect_bullets": True}, 3, 3, ORDINALS,
+        id="numbered_list",
+    ),
+    pytest.param(
+        [
+            _block("Block 1 text"),
+            _block("Block 2 text", 1, "seg_2"),
+            _block("Block 3 text", 2, "seg_3"),
+        ],
+        {}, 3, None, [],
+        id="multiple_blocks",
+    ),
+    pytest.param(
+        [_block(TEXT_MIXED)],
+        {}, 2, None, [],
+        id="mixed_content",
+    ),
+]
+
+# Blocks segmented together, in one segment() call, by the bulk_segments fixture
+BULK_BLOCKS: Final = [
+    _block("", 1, "seg_empty"),
+    _block("   ", 1, "seg_ws"),
+    _block("Page 1 text", 1, "seg_pg1"),
+    _block("Page 2 text", 2, "seg_pg2"),
+    PdfSegment(segment_id="seg_bbox", text="Text with bbox", page=1, bbox=SHARED_BBOX),
+    _block("Tekst po polsku z ąćęłńóśźż i konsultacja medyczna.", 1, "seg_unicode"),
+]
+
+
+@pytest.fixture(scope="module")
+def bulk_segments(segmenter):
+    """Segments of BULK_BLOCKS, shared by the tests checking one invariant each."""
+    return segmenter.segment(BULK_BLOCKS)
+
+
+def _segment_containing(segments, text):
+    """The single segment whose text contains ``text``."""
+    matches = [seg for seg in segments if text in seg.text]
+    assert len(matches) == 1, matches
+    return matches[0]
 
 
 class TestSegmenter:
     """Tests for Segmenter class."""
     
-    def test_initialization(self):
+    def test_initialization(self, segmenter):
         """Test segmenter initialization."""
-        segmenter = Segmenter()
         assert segmenter.soft_min_chars == 800
         assert segmenter.soft_max_chars == 1200
         assert segmenter.normalize_text_enabled is True
     
-    def test_initialization_custom(self):
+    def test_initialization_custom(self, segmenter_factory):
         """Test segmenter with custom parameters."""
-        segmenter = Segmenter(
+        segmenter = segmenter_factory(
             soft_min_chars=500,
             soft_max_chars=1000,
             normalize_text=False
@@ -32,7 +117,7 @@ class TestSegmenter:
         assert segmenter.soft_max_chars == 1000
         assert segmenter.normalize_text_enabled is False
     
-    def test_segment_short_block(self):
+    def test_segment_short_block(self, segmenter):
         """Test segmenting a short block (no splitting needed)."""
         block = PdfSegment(
             segment_id="seg_1",
@@ -42,80 +127,47 @@ class TestSegmenter:
             end_char=21
         )
         
-        segmenter = Segmenter()
         segments = segmenter.segment([block])
         
         assert len(segments) == 1
         assert segments[0].text == "Short paragraph text."
     
-    def test_segment_by_blank_lines(self):
-        """Test segmenting by blank lines (paragraphs)."""
-        text = """First paragraph text.
-
-Second paragraph text.
-
-Third paragraph text."""
-        
+    def test_unchanged_block_is_reused(self, segmenter):
+        """Test that a block needing no changes is returned as-is."""
         block = PdfSegment(
             segment_id="seg_1",
-            text=text,
+            text="Short paragraph text.",
             page=1,
             start_char=0,
-            end_char=len(text)
-        )
-        
-        segmenter = Segmenter()
-        segments = segmenter.segment([block])
-        
-        # Should create 3 segments
-        assert len(segments) >= 3
-        assert "First" in segments[0].text
-        assert "Second" in segments[1].text
-        assert "Third" in segments[2].text
-    
-    def test_segment_bullet_list(self):
-        """Test segmenting bullet list."""
-        text = """• First bullet point
-• Second bullet point
-• Third bullet point"""
-        
-        block = PdfSegment(
-            segment_id="seg_1",
-            text=text,
-            page=1
+            end_char=21
         )
         
-        segmenter = Segmenter(detect_bullets=True)
         segments = segmenter.segment([block])
         
-        # Should create 3 segments (one per bullet)
-        assert len(segments) == 3
-        assert "First" in segments[0].text
-        assert "Second" in segments[1].text
-        assert "Third" in segments[2].text
+        assert segments[0] is block
     
-    def test_segment_numbered_list(self):
-        """Test segmenting numbered list."""
-        text = """1. First item
-2. Second item
-3. Third item"""
-        
-        block = PdfSegment(
-            segment_id="seg_1",
-            text=text,
-            page=1
-        )
-        
-        segmenter = Segmenter(detect_bullets=True)
-        segments = segmenter.segment([block])
-        
-        assert len(segments) == 3
+    @pytest.mark.parametrize(
+        "blocks,kwargs,min_segments,max_segments,ordinals", SEGMENT_CASES
+    )
+    def test_segment_variants(
+        self, segmenter_factory, blocks, kwargs, min_segments, max_segments, ordinals
+    ):
+        """Test splitting paragraphs, lists and multiple blocks into segments."""
+        segments = segmenter_factory(**kwargs).segment(blocks)
+        
+        assert len(segments) >= min_segments
+        if max_segments is not None:
+            assert len(segments) <= max_segments
+        found = [
+            match.group(1) if (match := ORDINAL_RE.search(seg.text)) else None
+            for seg in segments[:len(ordinals)]
+        ]
+        assert found == ordinals
     
-    def test_split_long_paragraph(self):
+    def test_split_long_paragraph(self, segmenter_factory):
         """Test splitting a long paragraph at sentence boundaries."""
-        # Create a long paragraph (>1200 chars)
-        sentence = "This is a sentence about medical services. "
-        long_text = sentence * 30  # ~1260 chars
+        # A long paragraph (>1200 chars)
+        long_text = LONG_PARAGRAPH
         
         block = PdfSegment(
             segment_id="seg_1",
@@ -125,52 +177,36 @@ Third paragraph text."""
             end_char=len(long_text)
         )
         
-        segmenter = Segmenter(soft_max_chars=1200)
+        segmenter = segmenter_factory(soft_max_chars=1200)
         segments = segmenter.segment([block])
         
         # Should be split into multiple segments
         assert len(segments) > 1
         
-        # Each segment should be roughly within limits
-        for seg in segments:
-            # Allow some flexibility
-            assert len(seg.text) <= segmenter.soft_max_chars + 200
+        # Each segment should be roughly within limits (allow some flexibility)
+        assert max(len(seg.text) for seg in segments) <= segmenter.soft_max_chars + 200
     
-    def test_preserve_page_numbers(self):
+    def test_skip_empty_blocks(self, bulk_segments):
+        """Test that empty and whitespace-only blocks are skipped."""
+        assert len(bulk_segments) == 4
+        assert all(seg.text.strip() for seg in bulk_segments)
+    
+    def test_preserve_page_numbers(self, bulk_segments):
         """Test that page numbers are preserved."""
-        blocks = [
-            PdfSegment(segment_id="seg_1", text="Page 1 text", page=1),
-            PdfSegment(segment_id="seg_2", text="Page 2 text", page=2),
-        ]
-        
-        segmenter = Segmenter()
-        segments = segmenter.segment(blocks)
-        
-        assert segments[0].page == 1
-        assert segments[1].page == 2
+        assert _segment_containing(bulk_segments, "Page 1 text").page == 1
+        assert _segment_containing(bulk_segments, "Page 2 text").page == 2
     
-    def test_preserve_bboxes(self):
+    def test_preserve_bboxes(self, bulk_segments):
         """Test that bounding boxes are preserved."""
-        bbox = BBox(page=1, x0=50, y0=100, x1=400, y1=120)
-        block = PdfSegment(
-            segment_id="seg_1",
-            text="Text with bbox",
-            page=1,
-            bbox=bbox
-        )
+        bbox = _segment_containing(bulk_segments, "Text with bbox").bbox
         
-        segmenter = Segmenter()
-        segments = segmenter.segment([block])
-        
-        assert segments[0].bbox is not None
-        assert segments[0].bbox.page == 1
-        assert segments[0].bbox.x0 == 50
+        assert bbox is not None
+        assert bbox.page == 1
+        assert bbox.x0 == 50
     
-    def test_preserve_char_offsets(self):
+    def test_preserve_char_offsets(self, segmenter):
         """Test that character offsets are updated correctly."""
-        text = """First paragraph.
-
-Second paragraph."""
+        text = TEXT_TWO_PARAGRAPHS
         
         block = PdfSegment(
             segment_id="seg_1",
@@ -180,85 +216,52 @@ Second paragraph."""
             end_char=100 + len(text)
         )
         
-        segmenter = Segmenter()
         segments = segmenter.segment([block])
         
         # Offsets should be incremental
         assert segments[0].start_char == 100
         assert segments[1].start_char > segments[0].end_char
     
-    def test_table_detection(self):
+    def test_table_detection(self, segmenter_factory):
         """Test table row detection."""
         # Use tabs instead of spaces (more reliable for table detection after normalization)
         text = "Col1\tCol2\tCol3\nVal1\tVal2\tVal3\nVal4\tVal5\tVal6"
         
-        block = PdfSegment(
-            segment_id="seg_1",
-            text=text,
-            page=1
-        )
+        block = _block(text)
         
-        segmenter = Segmenter(detect_tables=True, normalize_text=False)
+        segmenter = segmenter_factory(detect_tables=True, normalize_text=False)
         segments = segmenter.segment([block])
         
         # Should detect as table and split into rows
         assert len(segments) >= 2
     
-    def test_skip_empty_blocks(self):
-        """Test that empty blocks are skipped."""
-        blocks = [
-            PdfSegment(segment_id="seg_1", text="", page=1),
-            PdfSegment(segment_id="seg_2", text="   ", page=1),
-            PdfSegment(segment_id="seg_3", text="Real text", page=1),
-        ]
-        
-        segmenter = Segmenter()
-        segments = segmenter.segment(blocks)
-        
-        # Should only keep non-empty
-        assert len(segments) == 1
-        assert "Real text" in segments[0].text
-    
-    def test_segment_id_generation(self):
+    def test_segment_id_generation(self, segment_text):
         """Test segment ID generation."""
-        text = """First paragraph.
-
-Second paragraph."""
-        
-        block = PdfSegment(segment_id="seg_1", text=text, page=1)
-        
-        segmenter = Segmenter()
-        segments = segmenter.segment([block])
+        segments = segment_text(TEXT_TWO_PARAGRAPHS)
         
         # IDs should be based on original + suffix
         assert segments[0].segment_id.startswith("seg_1")
         assert segments[1].segment_id.startswith("seg_1")
         assert segments[0].segment_id != segments[1].segment_id
     
-    def test_sentence_splitting(self):
+    def test_sentence_splitting(self, segmenter):
         """Test splitting at sentence boundaries."""
         text = ("This is sentence one. This is sentence two. "
                 "This is sentence three. This is sentence four.")
         
-        segmenter = Segmenter()
         sentences = segmenter._split_into_sentences(text)
         
         assert len(sentences) == 4
         assert "sentence one" in sentences[0]
         assert "sentence two" in sentences[1]
     
-    def test_multiple_blocks(self):
-        """Test segmenting multiple blocks."""
-        blocks = [
-            PdfSegment(segment_id="seg_1", text="Block 1 text", page=1),
-            PdfSegment(segment_id="seg_2", text="Block 2 text", page=1),
-            PdfSegment(segment_id="seg_3", text="Block 3 text", page=2),
-        ]
+    def test_sentence_splitting_punctuation_runs(self, segmenter):
+        """Test that repeated punctuation and ellipses stay with their sentence."""
+        text = "Wait... Really?! Yes… Done."
         
-        segmenter = Segmenter()
-        segments = segmenter.segment(blocks)
+        sentences = segmenter._split_into_sentences(text)
         
-        assert len(segments) >= 3
+        assert sentences == ["Wait...", "Really?!", "Yes…", "Done."]
 
 
 class TestConvenienceFunction:
@@ -267,8 +270,8 @@ class TestConvenienceFunction:
     def test_segment_pdf_blocks(self):
         """Test convenience function."""
         blocks = [
-            PdfSegment(segment_id="seg_1", text="Text 1", page=1),
-            PdfSegment(segment_id="seg_2", text="Text 2", page=1),
+            _block("Text 1"),
+            _block("Text 2", 1, "seg_2"),
         ]
         
         segments = segment_pdf_blocks(blocks)
@@ -278,10 +281,9 @@ class TestConvenienceFunction:
     
     def test_segment_pdf_blocks_options(self):
         """Test convenience function with custom options."""
-        # Create text with actual sentences so it can be split
-        sentence = "This is a test sentence. "
+        # Text with actual sentences so it can be split
         blocks = [
-            PdfSegment(segment_id="seg_1", text=sentence * 50, page=1),  # ~1250 chars
+            _block(LONG_TEST_PARAGRAPH),
         ]
         
         segments = segment_pdf_blocks(
@@ -297,84 +299,40 @@ class TestConvenienceFunction:
 class TestEdgeCases:
     """Tests for edge cases."""
     
-    def test_very_long_sentence(self):
-        """Test handling of very long sentences (>soft_max)."""
-        # Single sentence longer than soft_max
-        long_sentence = "This is a very long sentence " * 50 + "."
-        
-        block = PdfSegment(
-            segment_id="seg_1",
-            text=long_sentence,
-            page=1
-        )
-        
-        segmenter = Segmenter(soft_max_chars=500)
-        segments = segmenter.segment([block])
-        
-        # Should still create segments even if sentence is too long
-        assert len(segments) >= 1
-    
-    def test_no_sentence_endings(self):
-        """Test text without clear sentence endings."""
-        text = "text without clear endings and lots of content " * 30
-        
-        block = PdfSegment(segment_id="seg_1", text=text, page=1)
-        
-        segmenter = Segmenter(soft_max_chars=1000)
-        segments = segmenter.segment([block])
-        
-        # Should handle gracefully
+    @pytest.mark.parametrize(
+        "text,soft_max_chars",
+        [(VERY_LONG_SENTENCE, 500), (NO_SENTENCE_ENDINGS, 1000)],
+        ids=["very_long_sentence", "no_sentence_endings"],
+    )
+    def test_long_input_without_clean_splits(self, segment_text, text, soft_max_chars):
+        """Test long input with no usable split points (>soft_max sentence, no endings)."""
+        segments = segment_text(text, soft_max_chars=soft_max_chars)
+        
+        # Should still create segments and handle it gracefully
         assert len(segments) >= 1
     
-    def test_mixed_content(self):
-        """Test mixed content (paragraphs + bullets)."""
-        text = """Regular paragraph text.
-
-• Bullet one
-• Bullet two
-
-Another paragraph."""
-        
-        block = PdfSegment(segment_id="seg_1", text=text, page=1)
-        
-        segmenter = Segmenter()
-        segments = segmenter.segment([block])
-        
-        # Should handle mixed content
-        assert len(segments) >= 2
-    
-    def test_unicode_text(self):
+    def test_unicode_text(self, bulk_segments):
         """Test handling of Unicode text."""
-        text = "Tekst po polsku z ąćęłńóśźż i konsultacja medyczna."
-        
-        block = PdfSegment(segment_id="seg_1", text=text, page=1)
+        segment = _segment_containing(bulk_segments, "ąćęłńóśźż")
         
-        segmenter = Segmenter()
-        segments = segmenter.segment([block])
-        
-        assert len(segments) == 1
-        assert "ąćęłńóśźż" in segments[0].text
+        assert segment.text == "Tekst po polsku z ąćęłńóśźż i konsultacja medyczna."
 
 
 class TestIntegration:
     """Integration tests with normalizer."""
     
-    def test_normalization_in_segmentation(self):
+    def test_normalization_in_segmentation(self, segment_text):
         """Test that normalization is applied during segmentation."""
         text = "tekst  z    wieloma     spacjami"
         
-        block = PdfSegment(segment_id="seg_1", text=text, page=1)
-        
         # With normalization
-        segmenter = Segmenter(normalize_text=True)
-        segments = segmenter.segment([block])
+        segments = segment_text(text, normalize_text=True)
         
         # Multiple spaces should be cleaned
         assert "  " not in segments[0].text
         
         # Without normalization
-        segmenter_no_norm = Segmenter(normalize_text=False)
-        segments_no_norm = segmenter_no_norm.segment([block])
+        segments_no_norm = segment_text(text, normalize_text=False)
         
         # Spaces preserved
         assert "  " in segments_no_norm[0].text
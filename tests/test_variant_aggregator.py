@@ -1,10 +1,6 @@
 """Tests for variant aggregator."""
 
 import pytest
-from pathlib import Path
-import sys
-
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from siwz_mapper.models import PdfSegment
 from siwz_mapper.llm import SegmentClassification